@@ -0,0 +1,105 @@
+# Compares serialization of datasource data through pydantic response model (as FastAPI does for response_model)
+# with fast serialization straight to JSON. Checks that both ways return the same bytes and prints their timings.
+#
+# Usage (from backend folder): python benchmarks/serialization_benchmark.py --rows 10000 --repeat 5
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, date, timedelta, timezone, time as dt_time
+from decimal import Decimal
+from pathlib import Path
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from schemas.datasource import DatasourceDataWithColumnsRead  # noqa: E402
+from serialization import FastORJSONResponse  # noqa: E402
+
+
+def make_rows(rows_amount: int) -> list[dict]:
+    started_at = datetime(2024, 1, 1, 3, 0, 0)
+    return [
+        {
+            'load_id': i,
+            'object_id': i % 500,
+            'load_status': i % 4,
+            'extraction_type': 'FULL' if i % 2 else None,
+            'load_interval': timedelta(days=i % 3, hours=i % 24),
+            'extraction_from': started_at + timedelta(seconds=i, microseconds=i % 7),
+            'extraction_to': datetime(2024, 1, 2, tzinfo=timezone.utc) + timedelta(minutes=i),
+            'load_date': date(2024, 1, 1) + timedelta(days=i % 30),
+            'load_time': dt_time(i % 24, i % 60, i % 60),
+            'row_cnt': Decimal(i) / Decimal(7),
+            'load_uid': uuid.UUID(int=i),
+            'params': ['a', 'b', str(i)],
+            'enabled': i % 5 == 0,
+            'log_msg': f'Load of object {i % 500} finished with {i * 3} rows',
+        }
+        for i in range(rows_amount)
+    ]
+
+
+def make_content(rows_amount: int) -> dict:
+    rows = make_rows(rows_amount)
+    return {
+        'data': rows,
+        'columns': [
+            {'column_name': column_name, 'data_type': 'text', 'comment': None}
+            for column_name in rows[0]
+        ],
+        'next_cursor': None,
+        'total': rows_amount,
+    }
+
+
+def serialize_with_response_model(content: dict) -> bytes:
+    adapter = TypeAdapter(DatasourceDataWithColumnsRead)
+    value = adapter.validate_python(content)
+    return ORJSONResponse(adapter.dump_python(value, mode="json", by_alias=True)).body
+
+
+def serialize_fast(content: dict) -> bytes:
+    return FastORJSONResponse(content).body
+
+
+def measure(function, content: dict, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function(content)
+        timings.append(time.perf_counter() - started_at)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = make_content(args.rows)
+
+    model_body = serialize_with_response_model(content)
+    fast_body = serialize_fast(content)
+    if model_body != fast_body:
+        print("Serialized bodies are different")
+        sys.exit(1)
+
+    model_time = measure(serialize_with_response_model, content, args.repeat)
+    fast_time = measure(serialize_fast, content, args.repeat)
+    print(orjson.dumps({
+        'rows': args.rows,
+        'body_size': len(fast_body),
+        'response_model_seconds': round(model_time, 4),
+        'fast_seconds': round(fast_time, 4),
+        'speedup': round(model_time / fast_time, 2),
+    }, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
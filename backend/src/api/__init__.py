@@ -1,7 +1,10 @@
 from fastapi import APIRouter
 
+from .cache import router as cache_router
+from .chains import router as chains_router
 from .datasource import router as datasources_router
 from .datasource_column import router as datasource_columns_router
+from .jobs import router as jobs_router
 from .load_info import router as load_info_router
 from .validation import router as validation_router
 
@@ -11,3 +14,6 @@ router.include_router(datasources_router, prefix="/datasource")
 router.include_router(datasource_columns_router, prefix="/datasource_columns")
 router.include_router(load_info_router, prefix="/load_info")
 router.include_router(validation_router, prefix="/validation")
+router.include_router(cache_router, prefix="/cache")
+router.include_router(chains_router, prefix="/chains")
+router.include_router(jobs_router, prefix="/jobs")
@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+
+from config import settings
+from cron import get_cron_cache_stats
+from metadata_cache import metadata_cache
+from schemas.cache import CachesStatsRead, InvalidateCacheResponse
+from single_flight import datasource_single_flight
+from statement_cache import statement_cache
+from utils import check_table_availability
+
+router = APIRouter(tags=["Cache"])
+
+
+@router.get("/stats", response_model=CachesStatsRead)
+async def get_cache_stats():
+    return {
+        'metadata': metadata_cache.get_stats(),
+        'statements': statement_cache.get_stats(),
+        'cron': get_cron_cache_stats(),
+        'data': datasource_single_flight.get_stats(),
+    }
+
+
+# Should be called after changing structure of tables, so columns metadata is read from database again. Kept results
+# of data reads are removed too
+@router.post("/invalidate", response_model=InvalidateCacheResponse)
+async def invalidate_cache(
+        table_name: str | None = None,
+):
+    if table_name is not None:
+        check_table_availability(table_name)
+
+    invalidated = metadata_cache.invalidate(
+        schema=settings.db.database_schema,
+        table_name=table_name,
+    )
+    invalidated += datasource_single_flight.invalidate(table_name)
+    return {
+        'invalidated': invalidated,
+    }
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud import chains as chains_crud
+from db_helper import db_helper
+from schemas.chains import ChainsSchedulePreviewRead
+
+router = APIRouter(tags=["Chains"])
+
+
+# Returns next fire times of all chains schedules
+@router.get("/schedule_preview", response_model=ChainsSchedulePreviewRead)
+async def get_chains_schedule_preview(
+        count: int = Query(5, ge=1, le=100),
+        session: AsyncSession = Depends(db_helper.session_getter),
+):
+    schedules = await chains_crud.get_chains_schedule_preview(count=count, session=session)
+    return {
+        'schedules': schedules,
+    }
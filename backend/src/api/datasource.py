@@ -1,13 +1,23 @@
+from typing import AsyncGenerator, Mapping, Any
+
 from sqlalchemy.exc import DBAPIError
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Header
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import TextClause
+
+from config import settings
+from consts import DICTIONARY_TABLE_NAMES, TAIL_TABLE_COLUMNS
 
 from crud import datasource as datasource_crud
 from crud import datasource_column as datasource_column_crud
-from db_helper import db_helper
+from db_helper import db_helper, READ_PREFERENCE_HEADER
 from schemas.datasource import DatasourceDataReadInput, DatasourceDataWithColumnsRead, \
-    DatasourceDataWrite, DatasourceDataDelete
-from utils import parse_database_error, check_table_availability
+    DatasourceDataWrite, DatasourceDataDelete, PaginationMode, ExportFormat
+from serialization import serialize_rows_to_ndjson, serialize_rows_to_csv, FastORJSONResponse, SharedRows
+from tail import tail_broadcaster
+from utils import parse_database_error, check_table_availability, DataValidationError, get_etag, \
+    is_etag_matched, get_cache_headers, decode_cursor
 
 router = APIRouter(tags=["Datasource"])
 
@@ -16,31 +26,247 @@ router = APIRouter(tags=["Datasource"])
 async def get_datasource_data(
         params: DatasourceDataReadInput,
         table_name: str,
+        response: Response,
         skip: int = 0,
         limit: int = 100,
-        session: AsyncSession = Depends(db_helper.session_getter),
+        session: AsyncSession = Depends(db_helper.read_session_getter),
 ):
     check_table_availability(table_name)
+    return await read_datasource_data(
+        params=params,
+        table_name=table_name,
+        response=response,
+        skip=skip,
+        limit=limit,
+        session=session,
+    )
+
 
+# Conditional read of dictionary table: data isn't read if client has the same version of response (If-None-Match),
+# so 304 is returned
+@router.get("/dictionary_data", response_model=DatasourceDataWithColumnsRead)
+async def get_dictionary_data(
+        table_name: str,
+        response: Response,
+        skip: int = 0,
+        limit: int = 100,
+        if_none_match: str | None = Header(None),
+        session: AsyncSession = Depends(db_helper.read_session_getter),
+):
+    check_table_availability(table_name)
+    if table_name not in DICTIONARY_TABLE_NAMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Table {table_name} is not a dictionary",
+        )
+
+    table_version = await datasource_crud.get_table_version(table_name=table_name, session=session)
+    etag = get_etag(table_version, ["dictionary_data", table_name, skip, limit])
+    cache_headers = get_cache_headers(etag)
+    if is_etag_matched(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    return await read_datasource_data(
+        params=DatasourceDataReadInput(),
+        table_name=table_name,
+        response=response,
+        skip=skip,
+        limit=limit,
+        session=session,
+        cache_headers=cache_headers,
+    )
+
+
+async def read_datasource_data(
+        params: DatasourceDataReadInput,
+        table_name: str,
+        response: Response,
+        skip: int,
+        limit: int,
+        session: AsyncSession,
+        cache_headers: dict[str, str] | None = None,
+):
     table_columns = await datasource_column_crud.get_datasource_columns(
         table_name=table_name,
         session=session,
         with_comment=True,
     )
-    table_data = await datasource_crud.get_datasource_data(
+
+    keyset_order = None
+    if params.pagination == PaginationMode.KEYSET:
+        keyset_order = await datasource_crud.get_datasource_keyset_order(
+            table_name=table_name,
+            order_by=params.order_by,
+            table_columns=table_columns,
+            session=session,
+        )
+
+    # Values of typed filters are casted to column types, so database can reject them
+    try:
+        table_data = await datasource_crud.get_datasource_data(
+            table_name=table_name,
+            skip=skip,
+            limit=limit,
+            filters=params.filters,
+            order_by=params.order_by,
+            table_columns=table_columns,
+            keyset_order=keyset_order,
+            cursor=params.cursor,
+            columns=params.columns,
+            session=session,
+        )
+
+        total = await datasource_crud.get_datasource_data_total(
+            table_name=table_name,
+            mode=params.total,
+            filters=params.filters,
+            table_columns=table_columns,
+            session=session,
+        )
+    except DBAPIError as e:
+        error_message = parse_database_error(e)
+        raise HTTPException(
+            status_code=400,
+            detail=error_message,
+        )
+
+    next_cursor = None
+    if keyset_order is not None:
+        next_cursor = datasource_crud.get_next_page_cursor(table_data, keyset_order, limit)
+
+    # Return only descriptions of read columns
+    if params.columns is not None:
+        table_columns = [column for column in table_columns if column.column_name in params.columns]
+
+    content = {
+        'data': table_data,
+        'columns': table_columns,
+        'next_cursor': next_cursor,
+        'total': total,
+    }
+
+    # Returned response is not validated by response model
+    if settings.datasource.fast_serialization:
+        # Rows of coalesced reads are serialized once for all responses
+        if isinstance(table_data, SharedRows):
+            content['data'] = table_data.get_fragment()
+        return FastORJSONResponse(content, headers=cache_headers)
+
+    if cache_headers is not None:
+        response.headers.update(cache_headers)
+    return content
+
+
+# Exports whole table (with filters and ordering) as stream of NDJSON or CSV chunks
+@router.post("/export")
+async def export_datasource_data(
+        params: DatasourceDataReadInput,
+        table_name: str,
+        request: Request,
+        format: ExportFormat = ExportFormat.NDJSON,
+        session: AsyncSession = Depends(db_helper.read_session_getter),
+):
+    check_table_availability(table_name)
+    session_factory = await db_helper.get_read_session_factory(request.headers.get(READ_PREFERENCE_HEADER))
+
+    table_columns = await datasource_column_crud.get_datasource_columns(
         table_name=table_name,
-        skip=skip,
-        limit=limit,
+        session=session,
+    )
+    statement, statement_params = await datasource_crud.get_datasource_data_statement(
+        table_name=table_name,
+        skip=0,
+        limit=0,
         filters=params.filters,
         order_by=params.order_by,
         table_columns=table_columns,
+        columns=params.columns,
         session=session,
     )
 
-    return {
-        'data': table_data,
-        'columns': table_columns,
-    }
+    header = [column.column_name for column in table_columns]
+    if params.columns is not None:
+        header = list(dict.fromkeys(params.columns))
+
+    media_type = "application/x-ndjson" if format == ExportFormat.NDJSON else "text/csv"
+    return StreamingResponse(
+        export_datasource_data_chunks(
+            session_factory=session_factory,
+            statement=statement,
+            statement_params=statement_params,
+            format=format,
+            header=header,
+        ),
+        media_type=media_type,
+        headers={
+            'Content-Disposition': f'attachment; filename="{table_name}.{format.value}"',
+        },
+    )
+
+
+# Session from request dependency is closed before response body is sent, so stream uses its own session
+async def export_datasource_data_chunks(
+        session_factory: async_sessionmaker[AsyncSession],
+        statement: TextClause,
+        statement_params: Mapping[str, Any],
+        format: ExportFormat,
+        header: list[str],
+) -> AsyncGenerator[bytes | str, None]:
+    if format == ExportFormat.CSV:
+        yield serialize_rows_to_csv([], header=header)
+
+    async with session_factory() as session:
+        async for rows in datasource_crud.stream_datasource_data(
+                session=session,
+                statement=statement,
+                params=statement_params,
+                chunk_size=settings.datasource.export_chunk_size,
+        ):
+            if format == ExportFormat.CSV:
+                yield serialize_rows_to_csv(rows)
+            else:
+                yield serialize_rows_to_ndjson([row._mapping for row in rows])
+
+
+# Streams rows of logs or current loads added or changed after row pointed by since (or Last-Event-ID header of
+# reconnecting EventSource) as Server-Sent Events. Without cursor only rows added after connection are streamed
+@router.get("/tail")
+async def tail_datasource_data(
+        table_name: str,
+        since: str | None = None,
+        last_event_id: str | None = Header(None),
+        session: AsyncSession = Depends(db_helper.read_session_getter),
+):
+    check_table_availability(table_name)
+    if table_name not in TAIL_TABLE_COLUMNS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Live tail isn\'t available for \'{table_name}\' table",
+        )
+    column_name = TAIL_TABLE_COLUMNS[table_name]
+
+    cursor = since if since is not None else last_event_id
+    if cursor is None:
+        cursor = await datasource_crud.get_datasource_tail_cursor(
+            table_name=table_name,
+            column_name=column_name,
+            session=session,
+        )
+    # Invalid cursor is rejected before stream is started
+    decode_cursor(cursor, [(column_name, "asc")])
+
+    # Connection of request session isn't needed by stream
+    await session.close()
+
+    return StreamingResponse(
+        tail_broadcaster.stream(table_name=table_name, column_name=column_name, cursor=cursor),
+        media_type="text/event-stream",
+        headers={
+            'Cache-Control': 'no-cache',
+            # Disables buffering of events by nginx
+            'X-Accel-Buffering': 'no',
+        },
+    )
 
 
 @router.delete("/data")
@@ -79,6 +305,15 @@ async def write_data(
             new_rows=params.new_rows,
             session=session,
         )
+    except DataValidationError as e:
+        # Return errors of all invalid cells, so they can be shown at once
+        return ORJSONResponse(
+            status_code=e.status_code,
+            content={
+                'detail': e.detail,
+                'errors': e.errors,
+            },
+        )
     except DBAPIError as e:
         error_message = parse_database_error(e)
         raise HTTPException(
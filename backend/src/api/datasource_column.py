@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from consts import DICTIONARY_TABLE_NAMES
+from crud import datasource as datasource_crud
 from crud import datasource_column as datasource_column_crud
 from db_helper import db_helper
-from schemas.datasource_column import DatasourceColumnRead
-from utils import check_table_availability
+from schemas.datasource_column import DatasourceColumnRead, ValuesSearchMode
+from utils import check_table_availability, get_etag, is_etag_matched, get_cache_headers
 
 router = APIRouter(tags=["DatasourceColumn"])
 
@@ -12,7 +14,7 @@ router = APIRouter(tags=["DatasourceColumn"])
 @router.get("", response_model=list[DatasourceColumnRead])
 async def get_datasource_columns(
         table_name: str,
-        session: AsyncSession = Depends(db_helper.session_getter),
+        session: AsyncSession = Depends(db_helper.read_session_getter),
 ):
     check_table_availability(table_name)
 
@@ -27,15 +29,44 @@ async def get_datasource_columns(
 async def get_datasource_column_values(
         table_name: str,
         value_column_name: str,
+        response: Response,
         description_column_name: str | None = None,
-        session: AsyncSession = Depends(db_helper.session_getter),
+        search: str | None = None,
+        search_mode: ValuesSearchMode = ValuesSearchMode.PREFIX,
+        limit: int | None = Query(None, ge=1),
+        cursor: str | None = None,
+        distinct: bool = False,
+        if_none_match: str | None = Header(None),
+        session: AsyncSession = Depends(db_helper.read_session_getter),
 ):
     check_table_availability(table_name)
 
+    # Values of dictionary tables aren't read if client has the same version of response
+    if table_name in DICTIONARY_TABLE_NAMES:
+        table_version = await datasource_crud.get_table_version(table_name=table_name, session=session)
+        etag = get_etag(table_version, [
+            "values", table_name, value_column_name, description_column_name, search, search_mode, limit, cursor,
+            distinct,
+        ])
+        cache_headers = get_cache_headers(etag)
+        if is_etag_matched(if_none_match, etag):
+            return Response(status_code=304, headers=cache_headers)
+        response.headers.update(cache_headers)
+
     values = await datasource_column_crud.get_datasource_column_values(
         table_name=table_name,
         value_column_name=value_column_name,
         description_column_name=description_column_name,
+        search=search,
+        search_mode=search_mode,
+        limit=limit,
+        cursor=cursor,
+        distinct=distinct,
         session=session,
     )
-    return {"values": values}
+    next_cursor = datasource_column_crud.get_column_values_next_cursor(
+        values=values,
+        limit=limit,
+        need_description_column=description_column_name is not None,
+    )
+    return {"values": values, "next_cursor": next_cursor}
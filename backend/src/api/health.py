@@ -0,0 +1,58 @@
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql import text
+
+from config import settings
+from db_helper import db_helper
+from schemas.health import HealthRead, ReadinessRead
+
+router = APIRouter(tags=["Health"])
+
+
+# Checks only that server process is alive, doesn't use database
+@router.get("/health", response_model=HealthRead)
+async def get_health():
+    return {
+        'status': 'ok',
+    }
+
+
+# Checks that server can process requests: connections pool isn't exhausted and database answers in time.
+# Returns 503 otherwise, so load balancer doesn't route requests to this worker
+@router.get("/ready", response_model=ReadinessRead, responses={503: {"model": ReadinessRead}})
+async def get_readiness():
+    pool_status = db_helper.get_pool_status()
+
+    # Don't wait for connection from exhausted pool
+    if pool_status['saturation'] >= settings.health.max_pool_saturation:
+        return get_readiness_response(False, "Connections pool is exhausted", pool_status)
+
+    try:
+        async with asyncio.timeout(settings.health.ready_timeout):
+            async with db_helper.engine.connect() as connection:
+                await connection.execute(text("select 1;"))
+    except TimeoutError:
+        return get_readiness_response(False, "Database didn't answer in time", pool_status)
+    except (SQLAlchemyError, OSError) as e:
+        return get_readiness_response(False, str(e), pool_status)
+
+    return get_readiness_response(True, None, db_helper.get_pool_status())
+
+
+def get_readiness_response(
+        is_ready: bool,
+        error: str | None,
+        pool_status: dict[str, int | float],
+) -> ORJSONResponse:
+    return ORJSONResponse(
+        status_code=200 if is_ready else 503,
+        content={
+            'status': 'ready' if is_ready else 'not_ready',
+            'database': is_ready,
+            'error': error,
+            'pool': pool_status,
+        },
+    )
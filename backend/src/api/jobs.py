@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from config import settings
+from jobs import job_runner
+from schemas.jobs import JobRead
+
+router = APIRouter(tags=["Jobs"])
+
+
+# Returns state of job. If wait is set, response is returned when job is finished or wait time (seconds) is over
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job(
+        job_id: str,
+        wait: float = Query(0, ge=0),
+):
+    if wait > 0:
+        job_state = await job_runner.wait_job_state(job_id, min(wait, settings.jobs.max_wait))
+    else:
+        job_state = await job_runner.get_job_state(job_id)
+
+    if job_state is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job \'{job_id}\' doesn't exist",
+        )
+
+    return job_state
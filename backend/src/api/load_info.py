@@ -1,14 +1,23 @@
+from typing import Any, Mapping
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import DBAPIError
 
+from config import settings
 from crud import load_info as load_info_crud
 from db_helper import db_helper
-from schemas.load_info import GenerateLoadInfoInput, GenerateLoadInfoResponse
+from jobs import job_runner
+from schemas.jobs import JobRead
+from schemas.load_info import GenerateLoadInfoInput, GenerateLoadInfoResponse, GenerateLoadInfoBulkInput, \
+    GenerateLoadInfoBulkResponse, BulkGenerationMode
 from utils import parse_database_error
 
 router = APIRouter(tags=["LoadInfo"])
 
+GENERATE_LOAD_INFO_JOB_KIND = "generate_load_info"
+GENERATE_LOAD_INFO_BULK_JOB_KIND = "generate_load_info_bulk"
+
 
 @router.post("/generate", response_model=GenerateLoadInfoResponse)
 async def generate_load_info(
@@ -26,3 +35,131 @@ async def generate_load_info(
             status_code=400,
             detail=error_message,
         )
+
+
+# Generates loads of several objects: listed in items or all objects of load group with shared parameters
+@router.post("/generate_bulk", response_model=GenerateLoadInfoBulkResponse)
+async def generate_load_info_bulk(
+        params: GenerateLoadInfoBulkInput,
+        session: AsyncSession = Depends(db_helper.session_getter),
+):
+    check_generate_load_info_bulk_params(params)
+
+    results = await execute_generate_load_info_bulk(params=params, session=session)
+    return {
+        'results': results,
+    }
+
+
+# Enqueues load generation and returns job, which state is available by /jobs/{job_id}
+@router.post("/generate_async", response_model=JobRead, status_code=202)
+async def generate_load_info_async(
+        params: GenerateLoadInfoInput,
+):
+    job = job_runner.submit(GENERATE_LOAD_INFO_JOB_KIND, params.model_dump())
+    return job.to_dict()
+
+
+# Enqueues bulk load generation and returns job, which state is available by /jobs/{job_id}
+@router.post("/generate_bulk_async", response_model=JobRead, status_code=202)
+async def generate_load_info_bulk_async(
+        params: GenerateLoadInfoBulkInput,
+):
+    check_generate_load_info_bulk_params(params)
+
+    job = job_runner.submit(GENERATE_LOAD_INFO_BULK_JOB_KIND, params.model_dump())
+    return job.to_dict()
+
+
+def check_generate_load_info_bulk_params(
+        params: GenerateLoadInfoBulkInput,
+):
+    if (params.items is None) == (params.load_group is None):
+        raise HTTPException(
+            status_code=400,
+            detail="Either items or load_group should be set",
+        )
+
+    if params.items is not None and len(params.items) > settings.load_info.bulk_max_objects:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Max amount of objects is {settings.load_info.bulk_max_objects}",
+        )
+
+
+async def execute_generate_load_info_bulk(
+        params: GenerateLoadInfoBulkInput,
+        session: AsyncSession,
+) -> list[dict[str, Any]]:
+    items = params.items
+    if items is None:
+        try:
+            object_ids = await load_info_crud.get_load_group_object_ids(
+                load_group=params.load_group,
+                only_active=params.only_active,
+                session=session,
+            )
+        except DBAPIError as e:
+            error_message = parse_database_error(e)
+            raise HTTPException(
+                status_code=400,
+                detail=error_message,
+            )
+        items = [
+            GenerateLoadInfoInput(object_id=object_id, **params.params.model_dump())
+            for object_id in object_ids
+        ]
+
+    if len(items) > settings.load_info.bulk_max_objects:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Max amount of objects is {settings.load_info.bulk_max_objects}",
+        )
+
+    if params.mode == BulkGenerationMode.PARALLEL:
+        # Connection of request session isn't needed anymore
+        await session.close()
+        return await load_info_crud.generate_load_info_in_parallel(
+            session_factory=db_helper.session_factory,
+            items=items,
+            concurrency=settings.load_info.bulk_concurrency,
+        )
+
+    return await load_info_crud.generate_load_info_in_transaction(items=items, session=session)
+
+
+# Jobs are executed outside of requests, so each job uses its own session
+async def run_generate_load_info_job(
+        params: Mapping[str, Any],
+) -> dict[str, Any]:
+    async with db_helper.session_factory() as session:
+        try:
+            load_info_id = await load_info_crud.generate_load_info(
+                params=GenerateLoadInfoInput(**params),
+                session=session,
+            )
+        except DBAPIError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=parse_database_error(e),
+            )
+
+    return {
+        'load_info_id': load_info_id,
+    }
+
+
+async def run_generate_load_info_bulk_job(
+        params: Mapping[str, Any],
+) -> dict[str, Any]:
+    async with db_helper.session_factory() as session:
+        results = await execute_generate_load_info_bulk(
+            params=GenerateLoadInfoBulkInput(**params),
+            session=session,
+        )
+
+    return GenerateLoadInfoBulkResponse(results=results).model_dump(mode="json")
+
+
+job_runner.register_handler(GENERATE_LOAD_INFO_JOB_KIND, run_generate_load_info_job)
+job_runner.register_handler(GENERATE_LOAD_INFO_BULK_JOB_KIND, run_generate_load_info_bulk_job)
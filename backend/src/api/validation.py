@@ -3,7 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from crud import validation as validation_crud
 from db_helper import db_helper
-from schemas.validation import ValidateValueResponse, ValidateValueInput
+from schemas.validation import ValidateValueResponse, ValidateValueInput, ValidateValuesInput, \
+    ValidateValuesResponse
 
 router = APIRouter(tags=["Validation"])
 
@@ -22,3 +23,16 @@ async def validate(
     return {
         'error': error,
     }
+
+
+# Validates many values by one request (for example, all cells of edited row)
+@router.post("/validate_batch", response_model=ValidateValuesResponse)
+async def validate_batch(
+        params: ValidateValuesInput,
+        session: AsyncSession = Depends(db_helper.session_getter),
+):
+    errors = await validation_crud.validate_values(values=params.values, session=session)
+
+    return {
+        'errors': errors,
+    }
@@ -9,6 +9,13 @@ class RunConfig(BaseModel):
     host: str = "127.0.0.1"
     port: int = 8001
     allowed_origin: Optional[str] = None
+    # Amount of worker processes started by production launcher (server.py)
+    workers: int = 1
+    # Total amount of database connections of all workers, connections pool of each worker is sized to fit it. If not
+    # set, several workers together use pool size and max overflow of one process
+    db_connections_budget: Optional[int] = None
+    # Time in seconds for finishing active requests after shutdown signal
+    graceful_shutdown_timeout: int = 30
 
 
 # Settings for api prefixes
@@ -26,6 +33,120 @@ class DatabaseConfig(BaseModel):
     echo_pool: bool = False
     max_overflow: int = 10
     pool_size: int = 50
+    # Check connections with simple query before using them, so connections broken after failover are replaced
+    pool_pre_ping: bool = True
+    # Time in seconds after which connections are reopened. -1 disables recycling
+    pool_recycle: int = 1800
+    # Time in seconds for waiting free connection from pool
+    pool_timeout: float = 30
+    # Amount of prepared statements cached by database driver for each connection
+    prepared_statement_cache_size: int = 500
+    # Max time in milliseconds of executing one sql statement. 0 disables timeout
+    statement_timeout: int = 0
+    # Compatibility with external pooler (PgBouncer) in transaction mode: prepared statements aren't cached by driver
+    # and statement timeout is set for each transaction
+    external_pooler: bool = False
+    # Url of read-only standby, which is used by endpoints reading data
+    replica_url: Optional[PostgresDsn] = None
+    # Max lag of replica in seconds. If replica lags more or is unavailable, data is read from primary
+    replica_max_lag: float = 30
+    # Time in seconds during which result of replica availability and lag check is reused
+    replica_check_interval: float = 5
+    # Max time in seconds of replica check. Replica, which doesn't respond during it, is considered unavailable
+    replica_check_timeout: float = 1
+
+
+# Settings for in-process caches
+class CacheConfig(BaseModel):
+    # Time in seconds during which columns metadata of tables is reused. 0 disables caching
+    metadata_ttl: float = 300
+    # Max amount of dynamically built sql statements kept for reuse. 0 disables caching
+    statement_cache_size: int = 256
+    # Max amount of memoized results of cron expressions parsing
+    cron_cache_size: int = 1024
+    # Time in seconds during which results of datasource reads are reused by identical reads. 0 disables cache
+    data_ttl: float = 0
+    # Max amount of kept results of datasource reads
+    data_cache_size: int = 256
+
+
+# Settings for reading and writing data of datasources
+class DatasourceConfig(BaseModel):
+    # Amount of rows fetched from database cursor at once while exporting table
+    export_chunk_size: int = 1000
+    # Max amount of rows inserted, updated or deleted by one statement
+    write_batch_size: int = 500
+    # Serialize rows of read endpoints directly to JSON, without building pydantic models for each row
+    fast_serialization: bool = True
+    # Time in seconds during which clients reuse cached data of dictionary tables without revalidation by ETag
+    dictionary_cache_max_age: int = 0
+    # Version of dictionary data is taken from statistics of tables instead of hashing their rows. Only for PostgreSQL:
+    # statistics of Greenplum master don't count changes executed on segments. Statistics are updated with a delay
+    # (up to a second), so changed data can be returned as not modified during it
+    dictionary_version_by_statistics: bool = False
+    # Identical concurrent reads of data share one execution of query and one serialized result
+    coalesce_reads: bool = True
+
+
+# Settings for profiling of requests and sql statements
+class ProfilingConfig(BaseModel):
+    # Statements executed longer than this time in seconds are logged. 0 disables logging
+    slow_query_threshold: float = 1.0
+    # Add Server-Timing header with time of sql statements, serialization and whole request to responses
+    server_timing: bool = False
+
+
+# Settings for live tail of tables (logs, current loads) over Server-Sent Events
+class TailConfig(BaseModel):
+    # Time in seconds between checks of table for new rows. One check is shared by all clients of table
+    poll_interval: float = 2
+    # Time in seconds between keep-alive comments sent to client when there are no new rows
+    heartbeat_interval: float = 15
+    # Max amount of rows read by one query (can be exceeded by rows with the same value of tail column)
+    max_rows: int = 1000
+    # Amount of the last read rows, which are read again to find rows committed later than rows after them
+    lookback_rows: int = 100
+    # Max amount of unsent batches of rows for one client. Slow client is disconnected and reconnects from last seen row
+    queue_size: int = 100
+
+
+# Settings for generation of loads
+class LoadInfoConfig(BaseModel):
+    # Max amount of objects in one bulk generation request
+    bulk_max_objects: int = 1000
+    # Max amount of sessions used simultaneously by parallel bulk generation
+    bulk_concurrency: int = 4
+
+
+# Settings for health and readiness checks
+class HealthConfig(BaseModel):
+    # Time in seconds for getting connection from pool and executing test query
+    ready_timeout: float = 2
+    # Server isn't ready when ratio of connections in use to max amount of connections reaches this value
+    max_pool_saturation: float = 1.0
+
+
+# Settings for background jobs
+class JobsConfig(BaseModel):
+    # Amount of jobs executed at the same time by each server process
+    workers: int = 2
+    # Max amount of queued jobs, new jobs are rejected when queue is full
+    queue_size: int = 1000
+    # Amount of finished jobs, which states are kept in memory
+    max_finished_jobs: int = 1000
+    # Path to JSONL file with states of jobs. Allows to get states of jobs of other processes and after restart.
+    # server.py uses file in temporary directory by default when several workers are started
+    journal_path: Optional[str] = None
+    # Size of journal in bytes, after which it's compacted (0 - journal is compacted only on start)
+    journal_max_size: int = 10 * 1024 * 1024
+    # Max time in seconds of waiting for job finish in one request
+    max_wait: float = 30
+
+
+# Settings for exposing metrics for Prometheus
+class MetricsConfig(BaseModel):
+    enabled: bool = True
+    path: str = "/metrics"
 
 
 # Different settings for backend server
@@ -39,6 +160,14 @@ class Settings(BaseSettings):
     run: RunConfig = RunConfig()
     api: ApiPrefix = ApiPrefix()
     db: DatabaseConfig
+    cache: CacheConfig = CacheConfig()
+    datasource: DatasourceConfig = DatasourceConfig()
+    load_info: LoadInfoConfig = LoadInfoConfig()
+    jobs: JobsConfig = JobsConfig()
+    tail: TailConfig = TailConfig()
+    health: HealthConfig = HealthConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
 
 
 settings = Settings()
@@ -20,6 +20,23 @@ CLIENT_ALLOWED_DATABASE_NAMES: dict[str, bool] = {
     "ext_tables_params": True,
 }
 
+# Small tables which change rarely. Responses with their data are cached by clients and revalidated by ETag
+DICTIONARY_TABLE_NAMES: set[str] = {
+    "d_extraction_type",
+    "d_load_type",
+    "d_load_method",
+    "d_load_group",
+    "d_delta_mode",
+}
+
+# Tables available for live tail and their columns, which values grow when rows are added or changed. Live tail
+# streams rows with values of these columns greater than the last value seen by client and rows committed later than
+# rows after them, if they are among the last APP_CONFIG__TAIL__LOOKBACK_ROWS rows
+TAIL_TABLE_COLUMNS: dict[str, str] = {
+    "logs": "log_id",
+    "load_status_today": "Последнее обновление",
+}
+
 # Defines validation types for columns from specific tables.
 # This allows to add custom validation for some columns.
 TABLE_COLUMN_VALIDATION_TYPE: dict[str, dict[str, str]] = {
@@ -27,3 +44,34 @@ TABLE_COLUMN_VALIDATION_TYPE: dict[str, dict[str, str]] = {
         "schedule": ColumnDataType.Cron.value,
     },
 }
+
+# Table and column with cron schedules of chains
+CHAINS_TABLE_NAME = "chains"
+CHAINS_SCHEDULE_COLUMN_NAME = "schedule"
+
+# Types of columns (from information_schema) which are filtered by equality of values by default
+NUMERIC_DATA_TYPES: set[str] = {
+    "smallint",
+    "integer",
+    "bigint",
+    "numeric",
+    "real",
+    "double precision",
+}
+
+# Types of columns (from information_schema) which can be compared with text patterns without casting
+TEXT_DATA_TYPES: set[str] = {
+    "text",
+    "character varying",
+    "character",
+}
+
+# Max amount of bind parameters in one sql statement supported by database driver
+MAX_STATEMENT_BIND_PARAMS = 32767
+
+# Operation of sql statements reading system catalogs (columns metadata, statistics of tables) in profiling and metrics
+CATALOG_STATEMENT_OPERATION = "catalog"
+
+# Environment variable with directory where worker processes store metrics, so metrics of all workers are exposed
+# together (set by production launcher)
+PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE = "PROMETHEUS_MULTIPROC_DIR"
@@ -0,0 +1,49 @@
+from datetime import datetime
+from functools import lru_cache
+
+from croniter import croniter
+
+from config import settings
+
+
+# Cron expressions are the same for many rows and requests (for example, chains.schedule), so results of their parsing
+# are memoized
+@lru_cache(maxsize=settings.cache.cron_cache_size)
+def is_valid_cron_expression(
+        expression: str,
+) -> bool:
+    return croniter.is_valid(expression)
+
+
+# Returns next fire times of cron expression after base time. Base time should be rounded (for example, to minutes),
+# so requests made at close time use memoized results
+@lru_cache(maxsize=settings.cache.cron_cache_size)
+def get_cron_next_runs(
+        expression: str,
+        base_time: datetime,
+        count: int,
+) -> tuple[datetime, ...]:
+    cron = croniter(expression, base_time)
+    return tuple(
+        cron.get_next(datetime)
+        for _ in range(count)
+    )
+
+
+def get_cron_cache_stats() -> dict[str, int | float]:
+    hits = 0
+    misses = 0
+    size = 0
+    for function in (is_valid_cron_expression, get_cron_next_runs):
+        cache_info = function.cache_info()
+        hits += cache_info.hits
+        misses += cache_info.misses
+        size += cache_info.currsize
+
+    requests_amount = hits + misses
+    return {
+        'size': size,
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / requests_amount if requests_amount > 0 else 0.0,
+    }
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from typing import List, Mapping, Any
+
+from croniter import CroniterBadCronError, CroniterBadDateError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from config import settings
+from consts import CHAINS_TABLE_NAME, CHAINS_SCHEDULE_COLUMN_NAME
+from cron import get_cron_next_runs
+from crud import datasource_column as datasource_column_crud
+from utils import quote_identifier, validate_cron_value
+
+
+# Returns next fire times of schedules of all chains. Times are calculated in UTC (like Airflow does by default)
+async def get_chains_schedule_preview(
+        session: AsyncSession,
+        count: int,
+) -> List[Mapping[str, Any]]:
+    primary_key_columns = await datasource_column_crud.get_table_primary_key_columns(
+        session=session,
+        table_name=CHAINS_TABLE_NAME,
+    )
+    selected_columns = [*primary_key_columns, CHAINS_SCHEDULE_COLUMN_NAME]
+
+    statement = text(
+        f"""SELECT {', '.join([quote_identifier(column_name) for column_name in selected_columns])}
+        FROM {settings.db.database_schema}.{CHAINS_TABLE_NAME}
+        ORDER BY {', '.join([quote_identifier(column_name) for column_name in selected_columns])};"""
+    )
+    result = await session.execute(statement)
+
+    # Round base time to minutes, so all rows with the same schedule (in this and close requests) are calculated once
+    base_time = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+
+    schedules: List[Mapping[str, Any]] = []
+    for row in result:
+        row_mapping = row._mapping
+        schedule = row_mapping[CHAINS_SCHEDULE_COLUMN_NAME]
+
+        next_runs, error = get_schedule_next_runs(schedule, base_time, count)
+        schedules.append({
+            'key': {column_name: row_mapping[column_name] for column_name in primary_key_columns},
+            'schedule': schedule,
+            'next_runs': next_runs,
+            'error': error,
+        })
+
+    return schedules
+
+
+# Returns next fire times of schedule and error message of invalid schedule. Chains with schedule "None" (or NULL)
+# aren't scheduled, so they don't have next runs. Valid expression can have no fire times (e.g. 31 of February), so
+# errors of calculation are returned as errors of schedule
+def get_schedule_next_runs(
+        schedule: str | None,
+        base_time: datetime,
+        count: int,
+) -> tuple[List[datetime], str | None]:
+    if schedule is None or schedule == "None":
+        return [], None
+
+    error = validate_cron_value(schedule)
+    if error is not None:
+        return [], error
+
+    try:
+        return list(get_cron_next_runs(schedule, base_time, count)), None
+    except (CroniterBadCronError, CroniterBadDateError) as e:
+        return [], f"invalid value of type cron: {schedule} ({e})"
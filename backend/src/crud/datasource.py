@@ -1,48 +1,74 @@
-from typing import List, Any, Mapping, Optional
+from typing import List, Any, Mapping, Optional, AsyncGenerator
+
+import orjson
 
 from fastapi import HTTPException
-from sqlalchemy import BindParameter, bindparam
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import BindParameter, bindparam, Row, Integer, TextClause
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine
 from sqlalchemy.sql import text
 
 from config import settings
+from consts import MAX_STATEMENT_BIND_PARAMS
 from crud import datasource_column as datasource_column_crud
+from crud import validation as validation_crud
 from models.datasource_column import DatasourceColumn
-from utils import get_where_statement_by_filters, get_order_by_statement_by_mapping, get_columns_dict, \
-    get_column_value_sql_statement_and_add_bind_param, validate_table_column_value
-
-
-async def get_datasource_data(
+from request_context import add_request_rows_returned, add_request_rows_written
+from schemas.datasource import TotalMode
+from serialization import orjson_default, SharedRows
+from single_flight import datasource_single_flight
+from statement_cache import statement_cache
+from utils import get_order_by_statement_by_mapping, get_columns_dict, \
+    get_column_value_sql_statement_and_add_bind_param, get_where_conditions_by_filters, \
+    get_where_statement_by_conditions, get_keyset_condition_by_cursor, get_order_by_statement_by_fields, encode_cursor, \
+    quote_identifier, get_batches, get_where_statement_by_filters, get_table_column_validation_type, DataValidationError, \
+    decode_cursor
+
+
+# Makes SELECT statement for reading datasource data with filters, ordering and pagination
+async def get_datasource_data_statement(
         session: AsyncSession,
         table_name: str,
         skip: int,
         limit: int,
-        filters: Mapping[str, str | int] | None = None,
+        filters: Mapping[str, Any] | None = None,
         order_by: Mapping[str, str] | None = None,
         table_columns: List[DatasourceColumn] | None = None,
-) -> List[Mapping[str, Any]]:
-    have_filters_or_order_by = filters is not None or order_by is not None
-    if have_filters_or_order_by and table_columns is None:
+        keyset_order: List[tuple[str, str]] | None = None,
+        cursor: str | None = None,
+        columns: List[str] | None = None,
+) -> tuple[TextClause, dict[str, Any]]:
+    need_columns_dict = filters is not None or order_by is not None or cursor is not None or columns is not None
+    if need_columns_dict and table_columns is None:
         table_columns = await datasource_column_crud.get_datasource_columns(session=session, table_name=table_name)
 
     columns_dict: Mapping[str, str] | None
-    if have_filters_or_order_by:
+    if need_columns_dict:
         columns_dict = get_columns_dict(table_columns)
 
     bind_params: list[BindParameter] = []
 
     # Make query WHERE statement
-    where_text = "" if filters is None else get_where_statement_by_filters(
+    where_conditions = [] if filters is None else get_where_conditions_by_filters(
         filters,
         columns_dict,
         bind_params,
     )
 
+    # For keyset pagination take only rows after cursor
+    if keyset_order is not None and cursor is not None:
+        where_conditions.append(get_keyset_condition_by_cursor(cursor, keyset_order, columns_dict, bind_params))
+
+    where_text = get_where_statement_by_conditions(where_conditions)
+
     # Make query ORDER BY statement
-    order_by_text = "" if order_by is None else get_order_by_statement_by_mapping(
-        order_by,
-        columns_dict,
-    )
+    order_by_text: str
+    if keyset_order is not None:
+        order_by_text = get_order_by_statement_by_fields(keyset_order)
+    else:
+        order_by_text = "" if order_by is None else get_order_by_statement_by_mapping(
+            order_by,
+            columns_dict,
+        )
 
     # Make query LIMIT statement
     limit_text: str
@@ -52,27 +78,362 @@ async def get_datasource_data(
     else:
         limit_text = ""
 
-    # Make query OFFSET statement
+    # Make query OFFSET statement (not used for keyset pagination, where cursor defines page start)
     offset_text: str
-    if skip > 0:
+    if skip > 0 and keyset_order is None:
         offset_text = "OFFSET :query_skip_amount"
         bind_params.append(bindparam('query_skip_amount', value=skip))
     else:
         offset_text = ""
 
+    # Make list of selected columns
+    select_text = "*"
+    if columns is not None:
+        select_text = ", ".join([
+            quote_identifier(column_name)
+            for column_name in get_selected_columns(columns, columns_dict, table_name, keyset_order)
+        ])
+
     table_name_with_schema = f"{settings.db.database_schema}.{table_name}"
+    return statement_cache.get_statement(
+        table_name,
+        "select",
+        f"SELECT {select_text} FROM {table_name_with_schema} {where_text} {order_by_text} {limit_text} {offset_text}",
+        bind_params,
+    )
+
+
+# Returns list of columns for reading and throws error if some column doesn't exist. Columns used in keyset pagination
+# are added to list, because cursor of next page is made from them
+def get_selected_columns(
+        columns: List[str],
+        columns_dict: Mapping[str, str],
+        table_name: str,
+        keyset_order: List[tuple[str, str]] | None = None,
+) -> List[str]:
+    for column_name in columns:
+        if column_name not in columns_dict:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Column \'{column_name}\' doesn't exist in \'{table_name}\' table",
+            )
+
+    selected_columns = list(dict.fromkeys(columns))
+    if keyset_order is not None:
+        for column_name, _ in keyset_order:
+            if column_name not in selected_columns:
+                selected_columns.append(column_name)
+
+    return selected_columns
+
+
+async def get_datasource_data(
+        session: AsyncSession,
+        table_name: str,
+        skip: int,
+        limit: int,
+        filters: Mapping[str, Any] | None = None,
+        order_by: Mapping[str, str] | None = None,
+        table_columns: List[DatasourceColumn] | None = None,
+        keyset_order: List[tuple[str, str]] | None = None,
+        cursor: str | None = None,
+        columns: List[str] | None = None,
+) -> List[Mapping[str, Any]]:
+    statement, params = await get_datasource_data_statement(
+        session=session,
+        table_name=table_name,
+        skip=skip,
+        limit=limit,
+        filters=filters,
+        order_by=order_by,
+        table_columns=table_columns,
+        keyset_order=keyset_order,
+        cursor=cursor,
+        columns=columns,
+    )
+
+    if settings.datasource.coalesce_reads:
+        # Text of statement and values of params define result: table, filters, ordering, page and columns
+        key = (
+            table_name,
+            session.bind,
+            statement.text,
+            orjson.dumps(params, default=orjson_default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+        )
+        # Statement is executed by separate session, so connection of request session is returned to pool while
+        # waiting. Otherwise each waiting request holds one connection and waits for another one
+        data = await datasource_single_flight.run(
+            key,
+            lambda: execute_shared_statement(bind=session.bind, statement=statement, params=params),
+            before_wait=session.close,
+        )
+    else:
+        result = await session.execute(statement, params)
+
+        # Transform raw arrays of data to dicts with column fields
+        data = [
+            row._mapping
+            for row in result
+        ]
+
+    add_request_rows_returned(len(data))
+    return data
+
+
+# Executes statement in separate session, because its result is shared by several requests, which sessions can be
+# closed before execution is finished
+async def execute_shared_statement(
+        bind: AsyncEngine,
+        statement: TextClause,
+        params: Mapping[str, Any],
+) -> SharedRows:
+    async with AsyncSession(bind=bind) as session:
+        result = await session.execute(statement, params)
+        return SharedRows(
+            row._mapping
+            for row in result
+        )
+
+
+# Returns amount of rows matching filters: exact or estimated by database planner
+async def get_datasource_data_total(
+        session: AsyncSession,
+        table_name: str,
+        mode: TotalMode,
+        filters: Mapping[str, Any] | None = None,
+        table_columns: List[DatasourceColumn] | None = None,
+) -> int | None:
+    if mode == TotalMode.NONE:
+        return None
+
+    if filters is not None and table_columns is None:
+        table_columns = await datasource_column_crud.get_datasource_columns(session=session, table_name=table_name)
+
+    bind_params: list[BindParameter] = []
+    where_text = "" if filters is None else get_where_statement_by_filters(
+        filters,
+        get_columns_dict(table_columns),
+        bind_params,
+    )
+    table_name_with_schema = f"{settings.db.database_schema}.{table_name}"
+
+    if mode == TotalMode.EXACT:
+        statement, params = statement_cache.get_statement(
+            table_name,
+            "count",
+            f"SELECT count(*) AS total FROM {table_name_with_schema} {where_text}",
+            bind_params,
+        )
+        result = await session.execute(statement, params)
+        return result.scalar_one()
+
+    # Without filters amount of rows in table is taken from statistics of table
+    if where_text == "":
+        statement = text(
+            """SELECT c.reltuples::bigint AS total FROM pg_catalog.pg_class c
+            WHERE c.oid = CAST(:table_name_with_schema AS regclass) AND c.relkind IN ('r', 'p', 'm')"""
+        ).bindparams(bindparam('table_name_with_schema', value=table_name_with_schema))
+        result = await session.execute(statement)
+        total = result.scalar_one_or_none()
+
+        # Statistics is missing for views and not analyzed tables
+        if total is not None and total > 0:
+            return total
+
+    # Use planner estimation of amount of rows returned by query
+    statement, params = statement_cache.get_statement(
+        table_name,
+        "explain",
+        f"EXPLAIN (FORMAT JSON) SELECT * FROM {table_name_with_schema} {where_text}",
+        bind_params,
+    )
+    result = await session.execute(statement, params)
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = orjson.loads(plan)
+
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+# Returns version of data of small tables (dictionaries): hash of all rows of table. If enabled, version is made from
+# counters of inserted, updated and deleted rows from statistics of table instead, so data isn't read. Statistics of
+# standby don't count changes made on primary, so there (and for relations without statistics) hash is used too
+async def get_table_version(
+        session: AsyncSession,
+        table_name: str,
+) -> str:
+    version = None
+    if settings.datasource.dictionary_version_by_statistics:
+        table_name_with_schema = f"{settings.db.database_schema}.{table_name}"
+        statement = text(
+            """SELECT concat_ws(':', s.n_tup_ins, s.n_tup_upd, s.n_tup_del, pg_postmaster_start_time()) AS version
+            FROM pg_catalog.pg_stat_user_tables s
+            WHERE s.relid = CAST(:table_name_with_schema AS regclass) AND NOT pg_is_in_recovery()"""
+        ).bindparams(bindparam('table_name_with_schema', value=table_name_with_schema))
+        result = await session.execute(statement)
+        version = result.scalar_one_or_none()
+
+    if version is None:
+        version = await get_table_content_hash(session=session, table_name=table_name)
+
+    return version
+
+
+# Returns hash of all rows of table, so rows order in storage doesn't affect it
+async def get_table_content_hash(
+        session: AsyncSession,
+        table_name: str,
+) -> str:
     statement = text(
-        f"SELECT * FROM {table_name_with_schema} {where_text} {order_by_text} {limit_text} {offset_text}"
-    ).bindparams(*bind_params)
+        f"""SELECT md5(COALESCE(string_agg(t::text, E'\\n' ORDER BY t::text), '')) AS version
+        FROM {settings.db.database_schema}.{table_name} t"""
+    )
+    result = await session.execute(statement)
+    return result.scalar_one()
 
+
+# Returns cursor pointing to the last row of table by tail column, so live tail starts from rows added after it
+async def get_datasource_tail_cursor(
+        session: AsyncSession,
+        table_name: str,
+        column_name: str,
+) -> str:
+    statement = text(
+        f"""SELECT max({quote_identifier(column_name)}) AS value
+        FROM {quote_identifier(settings.db.database_schema)}.{quote_identifier(table_name)}"""
+    )
     result = await session.execute(statement)
+    return encode_cursor([(column_name, "asc")], {column_name: result.scalar_one()})
+
+
+# Returns rows, which value of tail column is greater than value from cursor (rows added or changed after row pointed
+# by cursor), ordered by tail column. Values of tail column can be non-unique (timestamps), and cursor keeps only the
+# last value, so page isn't cut inside run of equal values: it's extended with all rows equal to the last row of limit
+async def get_datasource_tail_data(
+        session: AsyncSession,
+        table_name: str,
+        column_name: str,
+        cursor: str,
+        limit: int,
+        lookback: int = 0,
+) -> List[Mapping[str, Any]]:
+    table_columns = await datasource_column_crud.get_datasource_columns(session=session, table_name=table_name)
+    columns_dict = get_columns_dict(table_columns)
+
+    bind_params: list[BindParameter] = []
+    table_sql = f"{quote_identifier(settings.db.database_schema)}.{quote_identifier(table_name)}"
+    column_sql = quote_identifier(column_name)
+    cursor_value = decode_cursor(cursor, [(column_name, "asc")])[0]
+    if cursor_value is None:
+        # Table was empty, so all rows are new
+        condition = f"{column_sql} IS NOT NULL"
+    else:
+        value_sql = get_column_value_sql_statement_and_add_bind_param(
+            cursor_value,
+            columns_dict[column_name],
+            "cursor_value",
+            bind_params,
+        )
+        condition = f"{column_sql} > {value_sql}"
+        if lookback > 0:
+            # Last rows before cursor are read again, because rows committed later than rows after them would be
+            # missed otherwise
+            condition = f"""({condition} OR {column_sql} >= (
+                SELECT min(window_rows.value) FROM (
+                    SELECT {column_sql} AS value FROM {table_sql}
+                    WHERE {column_sql} <= {value_sql}
+                    ORDER BY {column_sql} DESC
+                    LIMIT :tail_lookback
+                ) window_rows
+            ))"""
+            bind_params.append(bindparam("tail_lookback", value=lookback, type_=Integer))
+    # Rows of lookback window aren't counted in limit
+    bind_params.append(bindparam("tail_limit", value=limit + lookback, type_=Integer))
+
+    statement = text(
+        f"""SELECT * FROM {table_sql}
+        WHERE {condition} AND {column_sql} <= (
+            SELECT max(page.value) FROM (
+                SELECT {column_sql} AS value FROM {table_sql}
+                WHERE {condition}
+                ORDER BY {column_sql}
+                LIMIT :tail_limit
+            ) page
+        )
+        ORDER BY {column_sql}"""
+    ).bindparams(*bind_params)
 
-    # Transform raw arrays of data to dicts with column fields
-    data = [
+    result = await session.execute(statement)
+    return [
         row._mapping
         for row in result
     ]
-    return data
+
+
+# Reads result of statement through server-side cursor and yields chunks of rows,
+# so memory usage doesn't depend on amount of rows in table
+async def stream_datasource_data(
+        session: AsyncSession,
+        statement: TextClause,
+        params: Mapping[str, Any],
+        chunk_size: int,
+) -> AsyncGenerator[List[Row], None]:
+    result = await session.stream(statement.execution_options(yield_per=chunk_size), params)
+
+    async for rows in result.partitions(chunk_size):
+        add_request_rows_returned(len(rows))
+        yield rows
+
+
+# Returns columns (with directions) used for keyset pagination: columns from ORDER BY and then primary key columns,
+# so order of rows is always unique. Without primary key (e.g. views) columns from ORDER BY can have equal values,
+# and rows with them would be skipped between pages, so keyset pagination isn't available
+async def get_datasource_keyset_order(
+        session: AsyncSession,
+        table_name: str,
+        order_by: Mapping[str, str] | None,
+        table_columns: List[DatasourceColumn] | None = None,
+) -> List[tuple[str, str]]:
+    if table_columns is None:
+        table_columns = await datasource_column_crud.get_datasource_columns(session=session, table_name=table_name)
+    columns_dict = get_columns_dict(table_columns)
+
+    keyset_order: List[tuple[str, str]] = []
+    if order_by is not None:
+        for column_name, direction in order_by.items():
+            if column_name not in columns_dict:
+                continue
+
+            keyset_order.append((column_name, "DESC" if direction.lower() == "desc" else "ASC"))
+
+    primary_key_columns = await datasource_column_crud.get_table_primary_key_columns(
+        session=session,
+        table_name=table_name,
+    )
+    if len(primary_key_columns) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Keyset pagination isn't available for table \'{table_name}\', because it doesn't have primary key",
+        )
+
+    ordered_columns = [column_name for column_name, _ in keyset_order]
+    for column_name in primary_key_columns:
+        if column_name not in ordered_columns:
+            keyset_order.append((column_name, "ASC"))
+
+    return keyset_order
+
+
+# Returns cursor for the next page of keyset pagination or None if there are no more rows
+def get_next_page_cursor(
+        data: List[Mapping[str, Any]],
+        keyset_order: List[tuple[str, str]],
+        limit: int,
+) -> str | None:
+    if limit <= 0 or len(data) < limit:
+        return None
+
+    return encode_cursor(keyset_order, data[-1])
 
 
 async def write_data(
@@ -93,111 +454,176 @@ async def write_data(
         )
 
     primary_key_column_type = columns_dict[primary_key_column]
+    table_name_with_schema = f"{settings.db.database_schema}.{table_name}"
 
-    # Process edited rows
+    # Validate all cells before any changes, so transaction is not started for invalid data
+    errors = await get_write_data_errors(
+        session=session,
+        table_name=table_name,
+        primary_key_column=primary_key_column,
+        columns_dict=columns_dict,
+        edited_rows=edited_rows,
+        new_rows=new_rows,
+    )
+    if errors is not None:
+        raise DataValidationError(errors)
+
+    # Process edited rows. Rows with the same set of edited columns are updated by one statement for each batch
     if edited_rows is not None:
+        # Edited columns names -> list of tuples (primary key value, edited row)
+        edited_rows_groups: dict[tuple[str, ...], List[tuple[Any, Mapping[str, Any]]]] = {}
         for primary_key_value, edited_row in edited_rows.items():
-            # Make where statement for row updates
-            bind_params: list[BindParameter] = []
+            # Make list of edited columns
+            edited_columns = [column_name for column_name in edited_row if column_name in columns_dict]
 
-            validate_table_column_value(
-                value=primary_key_value,
-                initial_data_type=primary_key_column_type,
-                table_name=table_name,
-                column_name=primary_key_column
-            )
-
-            primary_key_sql_value_statement = get_column_value_sql_statement_and_add_bind_param(
-                primary_key_value,
-                primary_key_column_type,
-                primary_key_column,
-                bind_params,
-            )
-
-            edit_where_statement: str = (f"WHERE {settings.db.database_schema}.{table_name}.{primary_key_column} = "
-                                         + primary_key_sql_value_statement)
-
-            # Make list of updates for each edited column
-            column_updates: List[str] = []
-            for column_name, column_value in edited_row.items():
-                if column_name not in columns_dict:
-                    continue
-
-                column_type = columns_dict[column_name]
-
-                validate_table_column_value(
-                    value=column_value,
-                    initial_data_type=column_type,
-                    table_name=table_name,
-                    column_name=column_name
+            if len(edited_columns) > 0:
+                edited_rows_groups.setdefault(tuple(sorted(edited_columns)), []).append(
+                    (primary_key_value, edited_row)
                 )
 
-                param_sql_value_statement = get_column_value_sql_statement_and_add_bind_param(
-                    column_value,
-                    column_type,
-                    column_name,
+        # Execute UPDATE statements
+        for edited_columns, rows in edited_rows_groups.items():
+            batch_size = get_write_batch_size(len(edited_columns) + 1)
+            for rows_batch in get_batches(rows, batch_size):
+                bind_params: list[BindParameter] = []
+
+                # Make list with row of values for each edited row: primary key value and edited values
+                values_rows: List[str] = []
+                for row_index, (primary_key_value, edited_row) in enumerate(rows_batch):
+                    row_values = [
+                        get_column_value_sql_statement_and_add_bind_param(
+                            primary_key_value,
+                            primary_key_column_type,
+                            f"key_{row_index}",
+                            bind_params,
+                        )
+                    ]
+                    for column_index, column_name in enumerate(edited_columns):
+                        row_values.append(get_column_value_sql_statement_and_add_bind_param(
+                            edited_row[column_name],
+                            columns_dict[column_name],
+                            f"value_{row_index}_{column_index}",
+                            bind_params,
+                        ))
+                    values_rows.append(f"({', '.join(row_values)})")
+
+                values_columns = ["key_value", *[f"value_{i}" for i in range(len(edited_columns))]]
+                column_updates = [
+                    f"{quote_identifier(column_name)} = edited_values.value_{i}"
+                    for i, column_name in enumerate(edited_columns)
+                ]
+
+                statement, params = statement_cache.get_statement(
+                    table_name,
+                    "update",
+                    (
+                            f"UPDATE {table_name_with_schema} SET {', '.join(column_updates)} " +
+                            f"FROM (VALUES {', '.join(values_rows)}) AS edited_values ({', '.join(values_columns)}) " +
+                            f"WHERE {table_name_with_schema}.{quote_identifier(primary_key_column)} = "
+                            f"edited_values.key_value"
+                    ),
                     bind_params,
                 )
-                column_updates.append(f"{column_name}={param_sql_value_statement}")
+                result = await session.execute(statement, params)
+                add_request_rows_written(result.rowcount)
 
-            # Execute UPDATE statement
-            if len(column_updates) > 0:
-                statement = text(
-                    (
-                            f"UPDATE {settings.db.database_schema}.{table_name} SET {", ".join(column_updates)} " +
-                            edit_where_statement
-                    )
-                ).bindparams(*bind_params)
-                await session.execute(statement)
-
-    # Add new rows
+    # Add new rows. Rows with the same set of columns are inserted by one statement for each batch
     if new_rows is not None:
+        # Columns names -> list of new rows
+        new_rows_groups: dict[tuple[str, ...], List[Mapping[str, Any]]] = {}
         for row in new_rows:
-            columns_list: List[str] = []
-            values_list: List[str] = []
-            bind_params: list[BindParameter] = []
-
-            # Form lists of columns and values for making insert statement
-            for column_name, column_value in row.items():
-                if column_name not in columns_dict:
-                    continue
-
-                column_type = columns_dict[column_name]
-
-                validate_table_column_value(
-                    value=column_value,
-                    initial_data_type=column_type,
-                    table_name=table_name,
-                    column_name=column_name
-                )
-
-                columns_list.append(column_name)
-
-                param_sql_value_statement = get_column_value_sql_statement_and_add_bind_param(
-                    column_value,
-                    column_type,
-                    column_name,
-                    bind_params,
-                )
-                values_list.append(param_sql_value_statement)
+            # Form list of columns for making insert statement
+            columns_list = [column_name for column_name in row if column_name in columns_dict]
 
             if len(columns_list) == 0:
                 continue
 
-            # Make and execute insert statement
-            statement = text(
-                (
-                        f"INSERT INTO {settings.db.database_schema}.{table_name} " +
-                        f"({', '.join([f"\"{column}\"" for column in columns_list])}) " +
-                        f"VALUES ({', '.join(values_list)})"
+            new_rows_groups.setdefault(tuple(sorted(columns_list)), []).append(row)
+
+        # Make and execute insert statements
+        for columns_list, rows in new_rows_groups.items():
+            batch_size = get_write_batch_size(len(columns_list))
+            for rows_batch in get_batches(rows, batch_size):
+                bind_params: list[BindParameter] = []
+
+                values_rows: List[str] = []
+                for row_index, row in enumerate(rows_batch):
+                    row_values = [
+                        get_column_value_sql_statement_and_add_bind_param(
+                            row[column_name],
+                            columns_dict[column_name],
+                            f"value_{row_index}_{column_index}",
+                            bind_params,
+                        )
+                        for column_index, column_name in enumerate(columns_list)
+                    ]
+                    values_rows.append(f"({', '.join(row_values)})")
+
+                statement, params = statement_cache.get_statement(
+                    table_name,
+                    "insert",
+                    (
+                            f"INSERT INTO {table_name_with_schema} " +
+                            f"({', '.join([quote_identifier(column) for column in columns_list])}) " +
+                            f"VALUES {', '.join(values_rows)}"
+                    ),
+                    bind_params,
                 )
-            ).bindparams(*bind_params)
-            await session.execute(statement)
+                result = await session.execute(statement, params)
+                add_request_rows_written(result.rowcount)
 
     await session.commit()
+    # Reads started after changes shouldn't get results read before them
+    datasource_single_flight.invalidate(table_name)
     return
 
 
+# Validates all cells of written rows. Cells are grouped by columns, so values of each column are validated in one pass,
+# and values which can't be validated locally are validated by one database query per type. Returns None if all cells
+# are valid, otherwise errors of invalid cells: rows group ("edited_rows" or "new_rows") -> row key (primary key value
+# or index of new row) -> column name -> error
+async def get_write_data_errors(
+        session: AsyncSession,
+        table_name: str,
+        primary_key_column: str,
+        columns_dict: Mapping[str, str],
+        edited_rows: Optional[Mapping[str, Mapping[str, Any]]],
+        new_rows: Optional[List[Mapping[str, Any]]],
+) -> dict[str, dict[str, dict[str, str]]] | None:
+    # Column name -> list of (rows group, row key, value)
+    columns_cells: dict[str, List[tuple[str, str, Any]]] = {}
+    if edited_rows is not None:
+        for primary_key_value, edited_row in edited_rows.items():
+            row_key = str(primary_key_value)
+            columns_cells.setdefault(primary_key_column, []).append(("edited_rows", row_key, primary_key_value))
+            for column_name, column_value in edited_row.items():
+                if column_name in columns_dict:
+                    columns_cells.setdefault(column_name, []).append(("edited_rows", row_key, column_value))
+
+    if new_rows is not None:
+        for row_index, row in enumerate(new_rows):
+            for column_name, column_value in row.items():
+                if column_name in columns_dict:
+                    columns_cells.setdefault(column_name, []).append(("new_rows", str(row_index), column_value))
+
+    cells: List[tuple[str, str, str]] = []
+    values: List[tuple[Any, str]] = []
+    for column_name, column_cells in columns_cells.items():
+        data_type = get_table_column_validation_type(columns_dict[column_name], table_name, column_name)
+        for rows_group, row_key, value in column_cells:
+            cells.append((rows_group, row_key, column_name))
+            values.append((value, data_type))
+
+    values_errors = await validation_crud.validate_values_of_data_types(session=session, values=values)
+
+    errors: dict[str, dict[str, dict[str, str]]] = {}
+    for (rows_group, row_key, column_name), error in zip(cells, values_errors):
+        if error is not None:
+            errors.setdefault(rows_group, {}).setdefault(row_key, {})[column_name] = error
+
+    return errors if len(errors) > 0 else None
+
+
 async def delete_rows(
         session: AsyncSession,
         table_name: str,
@@ -209,33 +635,54 @@ async def delete_rows(
     table_columns = await datasource_column_crud.get_datasource_columns(session=session, table_name=table_name)
     columns_dict = get_columns_dict(table_columns)
 
-    delete_start_statement: str = f"DELETE FROM {settings.db.database_schema}.{table_name} WHERE"
-
-    # Process deleted rows
+    # Group deleted rows by set of columns used for finding them
+    deleted_rows_groups: dict[tuple[str, ...], List[Mapping[str, Any]]] = {}
     for row in deleted_rows:
-        # Make list with column values needed for where part of row deletion sql
-        row_where_values: List[str] = []
-        bind_params: list[BindParameter] = []
-        for column_name, column_value in row.items():
-            if column_name not in columns_dict:
-                continue
+        row_columns = [column_name for column_name in row if column_name in columns_dict]
+        if len(row_columns) == 0:
+            continue
 
-            column_type = columns_dict[column_name]
+        deleted_rows_groups.setdefault(tuple(sorted(row_columns)), []).append(row)
 
-            param_sql_value_statement = get_column_value_sql_statement_and_add_bind_param(
-                column_value,
-                column_type,
-                column_name,
-                bind_params,
-            )
-            row_where_values.append(f"{column_name}={param_sql_value_statement}")
+    # Process deleted rows: DELETE FROM table WHERE (column1, column2) IN (VALUES (value1, value2), ...)
+    for row_columns, rows in deleted_rows_groups.items():
+        columns_sql = ", ".join([quote_identifier(column_name) for column_name in row_columns])
 
-        if len(row_where_values) == 0:
-            continue
+        for rows_batch in get_batches(rows, get_write_batch_size(len(row_columns))):
+            bind_params: list[BindParameter] = []
 
-        #  Execute DELETE statement for row
-        statement = text(f"{delete_start_statement} {" AND ".join(row_where_values)}").bindparams(*bind_params)
-        await session.execute(statement)
+            values_rows: List[str] = []
+            for row_index, row in enumerate(rows_batch):
+                row_values = [
+                    get_column_value_sql_statement_and_add_bind_param(
+                        row[column_name],
+                        columns_dict[column_name],
+                        f"value_{row_index}_{column_index}",
+                        bind_params,
+                    )
+                    for column_index, column_name in enumerate(row_columns)
+                ]
+                values_rows.append(f"({', '.join(row_values)})")
+
+            #  Execute DELETE statement for batch of rows
+            statement, params = statement_cache.get_statement(
+                table_name,
+                "delete",
+                f"DELETE FROM {settings.db.database_schema}.{table_name} " +
+                f"WHERE ({columns_sql}) IN (VALUES {', '.join(values_rows)})",
+                bind_params,
+            )
+            result = await session.execute(statement, params)
+            add_request_rows_written(result.rowcount)
 
     await session.commit()
+    # Reads started after changes shouldn't get results read before them
+    datasource_single_flight.invalidate(table_name)
     return
+
+
+# Returns amount of rows written by one statement, so amount of bind params doesn't exceed driver's limit
+def get_write_batch_size(
+        params_per_row: int,
+) -> int:
+    return max(1, min(settings.datasource.write_batch_size, MAX_STATEMENT_BIND_PARAMS // max(1, params_per_row)))
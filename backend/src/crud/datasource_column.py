@@ -1,12 +1,19 @@
-from typing import List, Optional
+from typing import List, Optional, Mapping, Any
 
 from fastapi import HTTPException
+from sqlalchemy import bindparam, BindParameter, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 
 from config import settings
+from enums import FilterOperator
+from metadata_cache import metadata_cache
 from models.datasource_column import DatasourceColumn, DatasourceColumnValue
-from utils import get_columns_dict
+from request_context import add_request_rows_returned
+from schemas.datasource import DatasourceFilter
+from schemas.datasource_column import ValuesSearchMode
+from utils import get_columns_dict, quote_identifier, get_where_condition_by_filter, get_keyset_condition_by_cursor, \
+    encode_cursor
 
 
 async def get_datasource_columns(
@@ -14,6 +21,12 @@ async def get_datasource_columns(
         table_name: str,
         with_comment=False,
 ) -> List[DatasourceColumn]:
+    # Columns rarely change, so they are read from catalog only when cached value is missing or expired
+    cache_key = (settings.db.database_schema, table_name, "columns", with_comment)
+    is_cached, cached_data = metadata_cache.get(cache_key)
+    if is_cached:
+        return cached_data
+
     statement = text(
         f"""select column_name, data_type{", col_description((table_schema||'.'||table_name)::regclass::oid, ordinal_position) as comment" if with_comment else ""}
         from information_schema.columns 
@@ -28,6 +41,38 @@ async def get_datasource_columns(
         row._mapping
         for row in result
     ]
+    metadata_cache.set(cache_key, data)
+    return data
+
+
+async def get_table_primary_key_columns(
+        session: AsyncSession,
+        table_name: str,
+) -> List[str]:
+    cache_key = (settings.db.database_schema, table_name, "primary_key")
+    is_cached, cached_data = metadata_cache.get(cache_key)
+    if is_cached:
+        return cached_data
+
+    statement = text(
+        """select kcu.column_name
+        from information_schema.table_constraints tc
+        join information_schema.key_column_usage kcu
+            on kcu.constraint_schema = tc.constraint_schema and kcu.constraint_name = tc.constraint_name
+        where tc.constraint_type = 'PRIMARY KEY' and tc.table_schema = :table_schema and tc.table_name = :table_name
+        order by kcu.ordinal_position;"""
+    ).bindparams(
+        bindparam('table_schema', value=settings.db.database_schema),
+        bindparam('table_name', value=table_name),
+    )
+
+    result = await session.execute(statement)
+
+    data = [
+        row.column_name
+        for row in result
+    ]
+    metadata_cache.set(cache_key, data)
     return data
 
 
@@ -36,6 +81,11 @@ async def get_datasource_column_values(
         table_name: str,
         value_column_name: str,
         description_column_name: Optional[str],
+        search: Optional[str] = None,
+        search_mode: ValuesSearchMode = ValuesSearchMode.PREFIX,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        distinct: bool = False,
 ) -> List[DatasourceColumnValue]:
     table_columns = await get_datasource_columns(session=session, table_name=table_name)
     columns_dict = get_columns_dict(table_columns)
@@ -55,14 +105,57 @@ async def get_datasource_column_values(
 
     # SELECT value_column_name AS value, description_column_name AS description from table
     columns_string = (
-            f"{value_column_name} AS value" +
-            (f", {description_column_name} AS description" if need_description_column else "")
+            f"{quote_identifier(value_column_name)} AS value" +
+            (f", {quote_identifier(description_column_name)} AS description" if need_description_column else "")
     )
 
+    bind_params: list[BindParameter] = []
+
+    # Search is made by value column, so values of dropdown are loaded only for typed text
+    where_text = ""
+    if search is not None and search != "":
+        search_condition = get_where_condition_by_filter(
+            value_column_name,
+            columns_dict[value_column_name],
+            DatasourceFilter(
+                op=FilterOperator.Prefix if search_mode == ValuesSearchMode.PREFIX else FilterOperator.Contains,
+                value=search,
+            ),
+            "search_value",
+            bind_params,
+        )
+        where_text = f"WHERE {search_condition}"
+
+    # Page of values starts after value and description from cursor. Rows with the same value and description are
+    # identical for client, so they are enough for keyset pagination. Such rows can't be told apart by cursor, so pages
+    # contain only distinct values (otherwise duplicates on the border of pages would be skipped)
+    if limit is not None or cursor is not None:
+        distinct = True
+    values_columns_dict = {"value": columns_dict[value_column_name]}
+    if need_description_column:
+        values_columns_dict["description"] = columns_dict[description_column_name]
+    keyset_order = [(column_name, "asc") for column_name in values_columns_dict]
+
+    keyset_where_text = ""
+    if cursor is not None:
+        keyset_condition = get_keyset_condition_by_cursor(cursor, keyset_order, values_columns_dict, bind_params)
+        keyset_where_text = f"WHERE {keyset_condition}"
+
+    limit_text = ""
+    if limit is not None:
+        limit_text = "LIMIT :values_limit"
+        bind_params.append(bindparam("values_limit", value=limit, type_=Integer))
+
     statement = text(
-        f"""SELECT {columns_string} FROM \"{settings.db.database_schema}\".\"{table_name}\"
-        order by {value_column_name};"""
-    )
+        f"""SELECT * FROM (
+            SELECT {"DISTINCT " if distinct else ""}{columns_string}
+            FROM {quote_identifier(settings.db.database_schema)}.{quote_identifier(table_name)}
+            {where_text}
+        ) AS column_values
+        {keyset_where_text}
+        ORDER BY {", ".join(values_columns_dict)}
+        {limit_text};"""
+    ).bindparams(*bind_params)
 
     result = await session.execute(statement)
 
@@ -71,4 +164,21 @@ async def get_datasource_column_values(
         row._mapping
         for row in result
     ]
+    add_request_rows_returned(len(data))
     return data
+
+
+# Returns cursor of next page of column values or None if there are no more values
+def get_column_values_next_cursor(
+        values: List[Mapping[str, Any]],
+        limit: Optional[int],
+        need_description_column: bool,
+) -> Optional[str]:
+    if limit is None or len(values) < limit or len(values) == 0:
+        return None
+
+    keyset_order = [("value", "asc")]
+    if need_description_column:
+        keyset_order.append(("description", "asc"))
+
+    return encode_cursor(keyset_order, values[-1])
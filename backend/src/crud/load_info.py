@@ -1,14 +1,30 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+from typing import List, Mapping, Any
+
+from sqlalchemy import bindparam
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.sql import text
 
 from config import settings
 from schemas.load_info import GenerateLoadInfoInput
-from utils import get_column_value_sql_statement_and_add_bind_param
+from utils import get_column_value_sql_statement_and_add_bind_param, parse_database_error
 
 
 async def generate_load_info(
         session: AsyncSession,
         params: GenerateLoadInfoInput,
+) -> int | None:
+    load_info_id = await execute_generate_load_info(session=session, params=params)
+    await session.commit()
+
+    return load_info_id
+
+
+# Calls load generation function without committing transaction
+async def execute_generate_load_info(
+        session: AsyncSession,
+        params: GenerateLoadInfoInput,
 ) -> int | None:
     bind_params = []
 
@@ -91,7 +107,6 @@ async def generate_load_info(
     ).bindparams(*bind_params)
 
     result = await session.execute(statement)
-    await session.commit()
 
     # Transform raw arrays of data to dicts with column fields
     data = [
@@ -101,3 +116,59 @@ async def generate_load_info(
 
     # Return ID of generated load
     return data[0]['f_gen_load_id']
+
+
+# Returns ids of objects of load group
+async def get_load_group_object_ids(
+        session: AsyncSession,
+        load_group: str,
+        only_active: bool,
+) -> List[int]:
+    statement = text(
+        f"""SELECT object_id FROM {settings.db.database_schema}.objects
+        WHERE load_group = :load_group {"AND active" if only_active else ""}
+        ORDER BY object_id;"""
+    ).bindparams(bindparam('load_group', value=load_group))
+
+    result = await session.execute(statement)
+    return [row.object_id for row in result]
+
+
+# Generates loads of objects in one transaction. Error of one object rolls back only its savepoint, so loads of other
+# objects are committed
+async def generate_load_info_in_transaction(
+        session: AsyncSession,
+        items: List[GenerateLoadInfoInput],
+) -> List[Mapping[str, Any]]:
+    results: List[Mapping[str, Any]] = []
+    for params in items:
+        try:
+            async with session.begin_nested():
+                load_info_id = await execute_generate_load_info(session=session, params=params)
+            results.append({'object_id': params.object_id, 'load_info_id': load_info_id})
+        except DBAPIError as e:
+            results.append({'object_id': params.object_id, 'error': parse_database_error(e)})
+
+    await session.commit()
+    return results
+
+
+# Generates loads of objects concurrently, each object in its own session. Amount of simultaneously used sessions is
+# limited by concurrency, so bulk generation doesn't take all connections of pool
+async def generate_load_info_in_parallel(
+        session_factory: async_sessionmaker[AsyncSession],
+        items: List[GenerateLoadInfoInput],
+        concurrency: int,
+) -> List[Mapping[str, Any]]:
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def generate_object_load_info(params: GenerateLoadInfoInput) -> Mapping[str, Any]:
+        async with semaphore:
+            async with session_factory() as session:
+                try:
+                    load_info_id = await generate_load_info(session=session, params=params)
+                    return {'object_id': params.object_id, 'load_info_id': load_info_id}
+                except DBAPIError as e:
+                    return {'object_id': params.object_id, 'error': parse_database_error(e)}
+
+    return await asyncio.gather(*[generate_object_load_info(params) for params in items])
@@ -1,12 +1,14 @@
-from typing import Any
+from typing import Any, List, Sequence
 
+from sqlalchemy import bindparam, String, ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 from sqlalchemy.exc import DBAPIError
 
 from enums import ColumnDataType
+from schemas.validation import ValidateValueInput
 from utils import parse_database_error, get_column_value_sql_statement_and_bind_param, \
-    get_value_validation_info
+    get_value_validation_info, format_column_validation_value, format_column_validation_type
 
 
 async def validate_value(
@@ -14,7 +16,15 @@ async def validate_value(
         value: Any,
         value_type: ColumnDataType,
 ) -> str | None:
-    error_message, was_validated = get_value_validation_info(value, value_type.value)
+    return await validate_value_of_data_type(session=session, value=value, data_type=value_type.value)
+
+
+async def validate_value_of_data_type(
+        session: AsyncSession,
+        value: Any,
+        data_type: str,
+) -> str | None:
+    error_message, was_validated = get_value_validation_info(value, data_type)
     if was_validated:
         return error_message
 
@@ -23,7 +33,7 @@ async def validate_value(
     try:
         sql_value_statement, bind_param = get_column_value_sql_statement_and_bind_param(
             value,
-            value_type.value,
+            data_type,
             'value',
         )
 
@@ -36,3 +46,94 @@ async def validate_value(
         error_message = parse_database_error(e)
 
     return error_message
+
+
+# Validates many values at once. Returns errors in order of values
+async def validate_values(
+        session: AsyncSession,
+        values: List[ValidateValueInput],
+) -> List[str | None]:
+    return await validate_values_of_data_types(
+        session=session,
+        values=[(item.value, item.type.value) for item in values],
+    )
+
+
+# Validates list of (value, data type) pairs. Values that can't be validated locally are validated by database: values
+# of one data type are casted by one statement, and if it fails, values are split in halves until invalid values are
+# found, so amount of statements depends on amount of invalid values, not on amount of all values. Session is rolled
+# back on errors, so it should be called before any changes in transaction. Returns errors in order of values
+async def validate_values_of_data_types(
+        session: AsyncSession,
+        values: List[tuple[Any, str]],
+) -> List[str | None]:
+    errors: List[str | None] = [None] * len(values)
+
+    # Data type -> (index, value formatted for casting) of values which should be validated by database
+    database_values_by_type: dict[str, List[tuple[int, Any]]] = {}
+    for i, (value, data_type) in enumerate(values):
+        try:
+            error_message, was_validated = get_value_validation_info(value, data_type)
+            if not was_validated:
+                database_values_by_type.setdefault(data_type, []).append(
+                    (i, format_column_validation_value(value, data_type))
+                )
+        except Exception:
+            error_message = f'invalid value of type {data_type}'
+
+        errors[i] = error_message
+
+    for data_type, database_values in database_values_by_type.items():
+        await find_invalid_values(
+            session=session,
+            data_type=data_type,
+            values=database_values,
+            errors=errors,
+        )
+
+    return errors
+
+
+# Checks (index, formatted value) pairs of one data type and sets errors of invalid values
+async def find_invalid_values(
+        session: AsyncSession,
+        data_type: str,
+        values: Sequence[tuple[int, Any]],
+        errors: List[str | None],
+):
+    error_message = await get_values_cast_error(
+        session=session,
+        formatted_values=[formatted_value for _, formatted_value in values],
+        data_type=data_type,
+    )
+    if error_message is None:
+        return
+
+    if len(values) == 1:
+        errors[values[0][0]] = error_message
+        return
+
+    middle = len(values) // 2
+    await find_invalid_values(session=session, data_type=data_type, values=values[:middle], errors=errors)
+    await find_invalid_values(session=session, data_type=data_type, values=values[middle:], errors=errors)
+
+
+# Casts all values to data type by one statement. Values are passed as one array, so their amount isn't limited by
+# amount of bind params or columns. Returns error message of database or None if all values are valid
+async def get_values_cast_error(
+        session: AsyncSession,
+        formatted_values: List[Any],
+        data_type: str,
+) -> str | None:
+    statement = text(
+        f"""select count(cast(validated_value as {format_column_validation_type(data_type)}))
+        from unnest(cast(:validated_values as text[])) as validated_value;"""
+    ).bindparams(bindparam('validated_values', value=formatted_values, type_=ARRAY(String)))
+
+    try:
+        await session.execute(statement)
+    except DBAPIError as e:
+        await session.rollback()
+        return parse_database_error(e)
+
+    return None
@@ -1,9 +1,31 @@
-from typing import AsyncGenerator
+import asyncio
+import logging
+import time
+from typing import AsyncGenerator, Any
+from uuid import uuid4
 
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, async_sessionmaker, AsyncSession
+from sqlalchemy.sql import text
 
 from config import settings
 
+logger = logging.getLogger(__name__)
+
+# Returns lag of replica in seconds. Replica which replayed all received changes doesn't lag, even if there were no
+# changes on primary for a long time. Primary (if replica url points to it) doesn't lag too
+REPLICA_LAG_STATEMENT = """SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END AS replica_lag;"""
+
+
+# Header with which client can choose database for reading data: "primary" or "replica" (replica is used even if it
+# lags behind primary)
+READ_PREFERENCE_HEADER = "X-Read-Preference"
+
 
 # Used for creating database connections sessions
 class DatabaseHelper:
@@ -14,32 +36,186 @@ class DatabaseHelper:
             echo_pool: bool = False,
             max_overflow: int = 10,
             pool_size: int = 5,
+            pool_pre_ping: bool = False,
+            pool_recycle: int = -1,
+            pool_timeout: float = 30,
+            prepared_statement_cache_size: int = 100,
+            statement_timeout: int = 0,
+            external_pooler: bool = False,
+            replica_url: str | None = None,
+            replica_max_lag: float = 30,
+            replica_check_interval: float = 5,
+            replica_check_timeout: float = 1,
     ) -> None:
-        self.engine: AsyncEngine = create_async_engine(
+        self.engine_kwargs: dict[str, Any] = {
+            'echo': echo,
+            'echo_pool': echo_pool,
+            'max_overflow': max_overflow,
+            'pool_size': pool_size,
+            'pool_pre_ping': pool_pre_ping,
+            'pool_recycle': pool_recycle,
+            'pool_timeout': pool_timeout,
+        }
+        self.prepared_statement_cache_size = prepared_statement_cache_size
+        self.statement_timeout = statement_timeout
+        self.external_pooler = external_pooler
+        self.max_overflow = max_overflow
+
+        self.engine: AsyncEngine = self.create_engine(url)
+        self.session_factory: async_sessionmaker[AsyncSession] = self.create_session_factory(self.engine)
+
+        # Read-only standby used by endpoints which only read data
+        self.replica_engine: AsyncEngine | None = None
+        self.replica_session_factory: async_sessionmaker[AsyncSession] | None = None
+        if replica_url is not None:
+            self.replica_engine = self.create_engine(replica_url)
+            self.replica_session_factory = self.create_session_factory(self.replica_engine)
+
+        self.replica_max_lag = replica_max_lag
+        self.replica_check_interval = replica_check_interval
+        self.replica_check_timeout = replica_check_timeout
+        # Result of last check of replica: is it available and its lag in seconds (None if it's unavailable)
+        self.replica_lag: float | None = None
+        self.replica_checked_at: float | None = None
+        self.replica_check_task: asyncio.Task | None = None
+
+    def create_engine(
+            self,
+            url: str,
+    ) -> AsyncEngine:
+        connect_args: dict[str, Any] = {
+            'prepared_statement_cache_size': self.prepared_statement_cache_size,
+        }
+        if self.external_pooler:
+            # Server connection can change between transactions in transaction pooling mode, so prepared statements
+            # aren't cached by driver, and names of statements are unique across all clients of pooler
+            connect_args = {
+                'prepared_statement_cache_size': 0,
+                'statement_cache_size': 0,
+                'prepared_statement_name_func': lambda: f"__asyncpg_{uuid4()}__",
+            }
+        elif self.statement_timeout > 0:
+            connect_args['server_settings'] = {
+                'statement_timeout': str(self.statement_timeout),
+            }
+
+        engine = create_async_engine(
             url=url,
-            echo=echo,
-            echo_pool=echo_pool,
-            max_overflow=max_overflow,
-            pool_size=pool_size,
+            connect_args=connect_args,
+            **self.engine_kwargs,
         )
 
-        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-            bind=self.engine,
+        # Pooler doesn't keep connection settings between transactions, so timeout is set for each transaction
+        if self.external_pooler and self.statement_timeout > 0:
+            statement_timeout = int(self.statement_timeout)
+
+            @event.listens_for(engine.sync_engine, "begin")
+            def set_statement_timeout(connection):
+                connection.exec_driver_sql(f"SET LOCAL statement_timeout = {statement_timeout}")
+
+        return engine
+
+    @staticmethod
+    def create_session_factory(
+            engine: AsyncEngine,
+    ) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            bind=engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
 
     async def dispose(self) -> None:
+        if self.replica_check_task is not None:
+            self.replica_check_task.cancel()
+            await asyncio.gather(self.replica_check_task, return_exceptions=True)
+            self.replica_check_task = None
         await self.engine.dispose()
+        if self.replica_engine is not None:
+            await self.replica_engine.dispose()
 
     async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.session_factory() as session:
             yield session
 
+    # Session for endpoints which only read data. It's opened to replica, if replica is available and doesn't lag
+    # behind primary, otherwise to primary
+    async def read_session_getter(self, request: Request) -> AsyncGenerator[AsyncSession, None]:
+        session_factory = await self.get_read_session_factory(request.headers.get(READ_PREFERENCE_HEADER))
+        async with session_factory() as session:
+            yield session
+
+    async def get_read_session_factory(
+            self,
+            read_preference: str | None = None,
+    ) -> async_sessionmaker[AsyncSession]:
+        if self.replica_session_factory is None or read_preference == "primary":
+            return self.session_factory
+
+        replica_lag = self.get_replica_lag()
+        if replica_lag is None:
+            return self.session_factory
+        if replica_lag > self.replica_max_lag and read_preference != "replica":
+            return self.session_factory
+
+        return self.replica_session_factory
+
+    # Returns lag of replica in seconds or None if replica is unavailable or isn't checked yet. Requests don't wait for
+    # check of replica (it can hang, if replica doesn't respond): result of the last check is returned, and expired
+    # result is refreshed by background task
+    def get_replica_lag(self) -> float | None:
+        if not self.is_replica_check_actual() and (self.replica_check_task is None or self.replica_check_task.done()):
+            self.replica_check_task = asyncio.create_task(self.check_replica())
+
+        return self.replica_lag
+
+    async def check_replica(self):
+        replica_lag: float | None = None
+        try:
+            async with asyncio.timeout(self.replica_check_timeout):
+                async with self.replica_engine.connect() as connection:
+                    result = await connection.execute(text(REPLICA_LAG_STATEMENT))
+                    replica_lag = float(result.scalar_one())
+        except (TimeoutError, SQLAlchemyError, OSError) as e:
+            if self.replica_lag is not None or self.replica_checked_at is None:
+                logger.warning("Replica is unavailable, data is read from primary: %s", e)
+        else:
+            if replica_lag > self.replica_max_lag and (self.replica_lag or 0) <= self.replica_max_lag:
+                logger.warning("Replica lags behind primary for %.1f s, data is read from primary", replica_lag)
+
+        self.replica_lag = replica_lag
+        self.replica_checked_at = time.monotonic()
+
+    def is_replica_check_actual(self) -> bool:
+        return (
+                self.replica_checked_at is not None and
+                time.monotonic() - self.replica_checked_at < self.replica_check_interval
+        )
+
     def get_engine(self) -> AsyncEngine:
         return self.engine
 
+    # Returns state of connections pool. Saturation is ratio of connections in use to max amount of connections
+    def get_pool_status(self) -> dict[str, int | float]:
+        pool = self.engine.pool
+        size = pool.size()
+        checked_out = pool.checkedout()
+
+        # Zero pool size or negative max overflow means unlimited amount of connections
+        saturation = 0.0
+        if size > 0 and self.max_overflow >= 0:
+            saturation = checked_out / (size + self.max_overflow)
+
+        return {
+            'size': size,
+            'max_overflow': self.max_overflow,
+            'checked_out': checked_out,
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'saturation': saturation,
+        }
+
 
 db_helper = DatabaseHelper(
     url=str(settings.db.url),
@@ -47,4 +223,14 @@ db_helper = DatabaseHelper(
     echo_pool=settings.db.echo_pool,
     max_overflow=settings.db.max_overflow,
     pool_size=settings.db.pool_size,
+    pool_pre_ping=settings.db.pool_pre_ping,
+    pool_recycle=settings.db.pool_recycle,
+    pool_timeout=settings.db.pool_timeout,
+    prepared_statement_cache_size=settings.db.prepared_statement_cache_size,
+    statement_timeout=settings.db.statement_timeout,
+    external_pooler=settings.db.external_pooler,
+    replica_url=str(settings.db.replica_url) if settings.db.replica_url is not None else None,
+    replica_max_lag=settings.db.replica_max_lag,
+    replica_check_interval=settings.db.replica_check_interval,
+    replica_check_timeout=settings.db.replica_check_timeout,
 )
@@ -11,3 +11,20 @@ class ColumnDataType(Enum):
     Interval = 'interval'
     Jsonb = 'jsonb'
     Cron = 'cron'
+
+
+class FilterOperator(str, Enum):
+    # Column value is equal to filter value
+    Eq = 'eq'
+    # Column value is one of filter values
+    In = 'in'
+    # Column value is between start and end (both are included and optional)
+    Range = 'range'
+    # Column value starts with filter value (case-sensitive, so index on text column can be used)
+    Prefix = 'prefix'
+    # Column value casted to text contains filter value (case-insensitive)
+    Contains = 'contains'
+    IsNull = 'is_null'
+    NotNull = 'not_null'
+    # Column value casted to text matches words of filter value
+    FullText = 'full_text'
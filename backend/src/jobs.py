@@ -0,0 +1,440 @@
+import asyncio
+import fcntl
+import glob
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Awaitable, BinaryIO, Callable, Iterator, Mapping, Optional
+from uuid import uuid4
+
+import orjson
+from fastapi import HTTPException
+
+from config import settings
+from schemas.jobs import JobStatus
+from serialization import orjson_default
+
+logger = logging.getLogger(__name__)
+
+# Function executing job of specific kind with its parameters and returning result, which can be serialized to JSON
+JobHandler = Callable[[Mapping[str, Any]], Awaitable[Any]]
+
+FINISHED_JOB_STATUSES = {JobStatus.SUCCEEDED, JobStatus.FAILED}
+
+STOPPED_JOB_ERROR = "Server was stopped before job was finished"
+
+
+class Job:
+    def __init__(
+            self,
+            kind: str,
+            params: Mapping[str, Any],
+    ) -> None:
+        self.id: str = uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status: JobStatus = JobStatus.QUEUED
+        self.created_at: datetime = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        # Is set when job is finished, so clients can wait for result
+        self.finished = asyncio.Event()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status.value,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': self.result,
+            'error': self.error,
+        }
+
+
+# Executes long-running operations in background, so http requests only enqueue them and return id of job.
+# Jobs are executed by limited amount of asyncio workers. States of jobs are kept in memory of process and, if journal
+# path is set, appended to JSONL journal, so jobs can be found by other worker processes and after restart.
+# Journal is compacted on start and when it grows: only the last states of unfinished and recent finished jobs are kept.
+# Journal is read and written in separate thread, so locks of journal held by other processes don't block event loop
+class JobRunner:
+    def __init__(
+            self,
+            workers: int,
+            queue_size: int,
+            max_finished_jobs: int,
+            journal_path: Optional[str] = None,
+            journal_max_size: int = 0,
+    ) -> None:
+        self.workers_amount = max(workers, 1)
+        self.queue_size = queue_size
+        self.max_finished_jobs = max_finished_jobs
+        self.journal_path = journal_path
+        self.journal_max_size = journal_max_size
+
+        # The last states of jobs read from journal (including jobs of other processes) in order of their changes.
+        # Journal is read from position of the last read line, so polling of job reads only appended lines
+        self.journal_states: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.journal_position = 0
+        self.journal_inode: Optional[int] = None
+        # Size of journal after the last compaction, journal isn't compacted again until it grows twice
+        self.journal_compacted_size = 0
+        # Runner writes its id to states of its jobs and holds lock of owner file while it's started. Lock is released
+        # by system when process dies, so unfinished jobs of runners which don't hold locks are known to be stopped
+        self.instance_id = uuid4().hex
+        self.owner_file: Optional[BinaryIO] = None
+        # One thread keeps order of journal writes and makes access to journal states sequential
+        self.journal_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jobs_journal")
+
+        self.handlers: dict[str, JobHandler] = {}
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self.queue: Optional[asyncio.Queue[Job]] = None
+        self.workers: list[asyncio.Task] = []
+
+    def register_handler(
+            self,
+            kind: str,
+            handler: JobHandler,
+    ):
+        self.handlers[kind] = handler
+
+    async def start(self):
+        await self.run_journal_operation(self.lock_owner_file)
+        await self.run_journal_operation(self.compact_journal)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.workers = [
+            asyncio.create_task(self.run_worker())
+            for _ in range(self.workers_amount)
+        ]
+
+    # Waits for running jobs during timeout, then cancels them. Unfinished jobs are marked as failed
+    async def stop(
+            self,
+            timeout: float,
+    ):
+        if len(self.workers) == 0:
+            return
+
+        running_jobs = [job for job in self.jobs.values() if job.status == JobStatus.RUNNING]
+        if len(running_jobs) > 0:
+            await asyncio.wait([asyncio.create_task(job.finished.wait()) for job in running_jobs], timeout=timeout)
+
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+        for job in list(self.jobs.values()):
+            if job.status not in FINISHED_JOB_STATUSES:
+                self.finish_job(job, error=STOPPED_JOB_ERROR)
+
+        await self.run_journal_operation(self.unlock_owner_file)
+
+    def submit(
+            self,
+            kind: str,
+            params: Mapping[str, Any],
+    ) -> Job:
+        if self.queue is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Jobs runner isn't started",
+            )
+
+        job = Job(kind=kind, params=params)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Jobs queue is full",
+            )
+
+        self.jobs[job.id] = job
+        self.write_journal(job)
+        return job
+
+    # Returns state of job. Jobs of other processes are read from journal
+    async def get_job_state(
+            self,
+            job_id: str,
+    ) -> Optional[dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+
+        return await self.run_journal_operation(self.get_journal_job_state, job_id)
+
+    # Waits until job is finished or timeout is over and returns state of job
+    async def wait_job_state(
+            self,
+            job_id: str,
+            timeout: float,
+    ) -> Optional[dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        if job is not None:
+            try:
+                await asyncio.wait_for(job.finished.wait(), timeout=timeout)
+            except TimeoutError:
+                pass
+            return job.to_dict()
+
+        # Job of other process is checked in journal periodically
+        deadline = time.monotonic() + timeout
+        while True:
+            job_state = await self.run_journal_operation(self.get_journal_job_state, job_id)
+            if job_state is None or job_state['status'] in FINISHED_JOB_STATUSES or time.monotonic() >= deadline:
+                return job_state
+            await asyncio.sleep(min(0.5, max(deadline - time.monotonic(), 0)))
+
+    async def run_worker(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                await self.run_job(job)
+            finally:
+                self.queue.task_done()
+
+    async def run_job(
+            self,
+            job: Job,
+    ):
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        self.write_journal(job)
+
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            self.finish_job(job, error=f"Unknown kind of job: {job.kind}")
+            return
+
+        try:
+            result = await handler(job.params)
+        except asyncio.CancelledError:
+            self.finish_job(job, error=STOPPED_JOB_ERROR)
+            raise
+        except HTTPException as e:
+            self.finish_job(job, error=str(e.detail))
+        except Exception as e:
+            logger.exception("Job %s of kind %s failed", job.id, job.kind)
+            self.finish_job(job, error=str(e))
+        else:
+            self.finish_job(job, result=result)
+
+    def finish_job(
+            self,
+            job: Job,
+            result: Any = None,
+            error: Optional[str] = None,
+    ):
+        job.status = JobStatus.FAILED if error is not None else JobStatus.SUCCEEDED
+        job.finished_at = datetime.now(timezone.utc)
+        job.result = result
+        job.error = error
+        job.finished.set()
+        self.write_journal(job)
+        self.remove_old_jobs()
+
+    # Keeps in memory only limited amount of finished jobs (the oldest ones are removed)
+    def remove_old_jobs(self):
+        finished_jobs_ids = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED_JOB_STATUSES]
+        for job_id in finished_jobs_ids[:max(len(finished_jobs_ids) - self.max_finished_jobs, 0)]:
+            del self.jobs[job_id]
+
+    async def run_journal_operation(
+            self,
+            operation: Callable[..., Any],
+            *args: Any,
+    ) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.journal_executor, operation, *args)
+
+    # State is serialized immediately and written to journal in thread without waiting
+    def write_journal(
+            self,
+            job: Job,
+    ):
+        if self.journal_path is None:
+            return
+
+        line = orjson.dumps(
+            {**job.to_dict(), 'owner': self.instance_id},
+            default=orjson_default,
+            option=orjson.OPT_APPEND_NEWLINE,
+        )
+        self.journal_executor.submit(self.append_journal_line, job.id, line)
+
+    def append_journal_line(
+            self,
+            job_id: str,
+            line: bytes,
+    ):
+        # Line is written by one call in append mode, so lines of different processes aren't mixed
+        try:
+            with self.lock_journal(exclusive=False), open(self.journal_path, "ab") as journal:
+                journal.write(line)
+                journal_size = journal.tell()
+        except OSError:
+            logger.exception("Can't write state of job %s to journal", job_id)
+            return
+
+        if 0 < self.journal_max_size < journal_size and journal_size > 2 * self.journal_compacted_size:
+            self.compact_journal()
+
+    # Journal is written by several processes: lines are appended under shared lock, and compaction, which replaces
+    # journal, holds exclusive lock, so lines appended during compaction aren't lost
+    @contextmanager
+    def lock_journal(
+            self,
+            exclusive: bool,
+    ) -> Iterator[None]:
+        with open(f"{self.journal_path}.lock", "ab") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_owner_file_path(
+            self,
+            instance_id: str,
+    ) -> str:
+        return f"{self.journal_path}.{instance_id}.owner"
+
+    def lock_owner_file(self):
+        if self.journal_path is None or self.owner_file is not None:
+            return
+
+        # File is created and locked under lock of journal, so compaction doesn't remove it as file of stopped runner
+        try:
+            with self.lock_journal(exclusive=False):
+                self.owner_file = open(self.get_owner_file_path(self.instance_id), "ab")
+                fcntl.flock(self.owner_file, fcntl.LOCK_EX)
+        except OSError:
+            logger.exception("Can't lock owner file of jobs runner")
+
+    def unlock_owner_file(self):
+        if self.owner_file is None:
+            return
+
+        try:
+            os.remove(self.get_owner_file_path(self.instance_id))
+        except OSError:
+            pass
+        self.owner_file.close()
+        self.owner_file = None
+
+    # Returns ids of runners, which are started in other processes. Owner files of stopped runners are removed
+    def get_alive_owners(self) -> set[str]:
+        alive_owners = {self.instance_id}
+        for file_path in glob.glob(f"{glob.escape(self.journal_path)}.*.owner"):
+            try:
+                with open(file_path, "rb") as owner_file:
+                    fcntl.flock(owner_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    os.remove(file_path)
+            except BlockingIOError:
+                alive_owners.add(os.path.basename(file_path).split(".")[-2])
+            except OSError:
+                continue
+        return alive_owners
+
+    # Rewrites journal with the last states of unfinished and recent finished jobs. Unfinished jobs of stopped runners
+    # (e.g. of killed processes) are marked as failed, so clients don't wait for them forever
+    def compact_journal(self):
+        if self.journal_path is None:
+            return
+
+        temp_path = f"{self.journal_path}.tmp"
+        try:
+            with self.lock_journal(exclusive=True):
+                self.read_journal()
+                alive_owners = self.get_alive_owners()
+                for job_id, job_state in list(self.journal_states.items()):
+                    if job_state.get('status') in FINISHED_JOB_STATUSES or job_state.get('owner') in alive_owners:
+                        continue
+                    self.journal_states[job_id] = {
+                        **job_state,
+                        'status': JobStatus.FAILED.value,
+                        'finished_at': datetime.now(timezone.utc),
+                        'error': STOPPED_JOB_ERROR,
+                    }
+
+                with open(temp_path, "wb") as journal:
+                    for job_state in self.journal_states.values():
+                        journal.write(orjson.dumps(job_state, option=orjson.OPT_APPEND_NEWLINE))
+                os.replace(temp_path, self.journal_path)
+
+                journal_stat = os.stat(self.journal_path)
+                self.journal_inode = journal_stat.st_ino
+                self.journal_position = journal_stat.st_size
+                self.journal_compacted_size = journal_stat.st_size
+        except OSError:
+            logger.exception("Can't compact journal of jobs")
+
+    # Reads lines appended to journal since the last read. Journal is read from the beginning if it was replaced
+    # by compaction of other process
+    def read_journal(self):
+        try:
+            with open(self.journal_path, "rb") as journal:
+                journal_stat = os.fstat(journal.fileno())
+                if journal_stat.st_ino != self.journal_inode or journal_stat.st_size < self.journal_position:
+                    self.journal_inode = journal_stat.st_ino
+                    self.journal_position = 0
+
+                journal.seek(self.journal_position)
+                for line in journal:
+                    # Line is being written by other process
+                    if not line.endswith(b"\n"):
+                        break
+                    self.journal_position += len(line)
+
+                    try:
+                        line_state = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+                    job_id = line_state.get('id')
+                    if job_id is None:
+                        continue
+
+                    self.journal_states.pop(job_id, None)
+                    self.journal_states[job_id] = line_state
+        except FileNotFoundError:
+            return
+
+        finished_jobs_ids = [
+            job_id
+            for job_id, job_state in self.journal_states.items()
+            if job_state.get('status') in FINISHED_JOB_STATUSES
+        ]
+        for job_id in finished_jobs_ids[:max(len(finished_jobs_ids) - self.max_finished_jobs, 0)]:
+            del self.journal_states[job_id]
+
+    # Returns the last state of job written to journal. States of finished jobs don't change, so journal is read only
+    # for unknown and unfinished jobs
+    def get_journal_job_state(
+            self,
+            job_id: str,
+    ) -> Optional[dict[str, Any]]:
+        if self.journal_path is None:
+            return None
+
+        job_state = self.journal_states.get(job_id)
+        if job_state is not None and job_state['status'] in FINISHED_JOB_STATUSES:
+            return job_state
+
+        self.read_journal()
+        return self.journal_states.get(job_id)
+
+job_runner = JobRunner(
+    workers=settings.jobs.workers,
+    queue_size=settings.jobs.queue_size,
+    max_finished_jobs=settings.jobs.max_finished_jobs,
+    journal_path=settings.jobs.journal_path,
+    journal_max_size=settings.jobs.journal_max_size,
+)
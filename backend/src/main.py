@@ -3,12 +3,18 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import ORJSONResponse
 
 from config import settings
 
 from api import router as api_router
+from api.health import router as health_router
 from db_helper import db_helper
+from jobs import job_runner
+from metrics import setup_metrics
+from profiler import instrument_engine
+from request_context import RequestContextMiddleware
+from serialization import TimedORJSONResponse
+from tail import tail_broadcaster
 
 
 # Runs actions before starting server and after closing server
@@ -18,16 +24,19 @@ async def lifespan(app: FastAPI):
     print(
         'Server docs are available at http://{host}:{port}/docs'.format(host=settings.run.host, port=settings.run.port)
     )
+    await job_runner.start()
 
     yield
 
     # On server shutdown
+    await job_runner.stop(timeout=settings.run.graceful_shutdown_timeout)
+    await tail_broadcaster.stop()
     print("Disposing database helper engine")
     await db_helper.dispose()
 
 
 main_app = FastAPI(
-    default_response_class=ORJSONResponse,
+    default_response_class=TimedORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -47,9 +56,23 @@ main_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # ETag is read by client for conditional requests of dictionary tables data
+    expose_headers=["ETag"],
 )
 
 main_app.include_router(api_router, prefix=settings.api.prefix)
+# Health checks are available without api prefix
+main_app.include_router(health_router)
+
+instrument_engine(db_helper.engine, settings.profiling.slow_query_threshold)
+if db_helper.replica_engine is not None:
+    instrument_engine(db_helper.replica_engine, settings.profiling.slow_query_threshold)
+
+if settings.metrics.enabled:
+    setup_metrics(main_app, db_helper.engine, settings.metrics.path)
+
+# Added last, so statistics of request are created before other middlewares are called
+main_app.add_middleware(RequestContextMiddleware, server_timing=settings.profiling.server_timing)
 
 if __name__ == "__main__":
     uvicorn.run(
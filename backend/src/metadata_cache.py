@@ -0,0 +1,82 @@
+import time
+from typing import Any, Hashable
+
+from config import settings
+
+
+# In-process cache with TTL for database metadata (columns of tables and etc.).
+# Metadata almost never changes, but is needed for almost every request, so reading it from catalog
+# on every call is a waste of database time. Keys are tuples starting with (schema, table_name).
+class MetadataCache:
+    def __init__(
+            self,
+            ttl: float,
+    ) -> None:
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Key -> (expiration time, value)
+        self._items: dict[tuple[Hashable, ...], tuple[float, Any]] = {}
+
+    # Returns tuple: (is value found, value)
+    def get(
+            self,
+            key: tuple[Hashable, ...],
+    ) -> tuple[bool, Any]:
+        item = self._items.get(key)
+        if item is not None:
+            expires_at, value = item
+            if expires_at > time.monotonic():
+                self.hits += 1
+                return True, value
+
+            del self._items[key]
+
+        self.misses += 1
+        return False, None
+
+    def set(
+            self,
+            key: tuple[Hashable, ...],
+            value: Any,
+    ) -> None:
+        if self.ttl <= 0:
+            return
+
+        self._items[key] = (time.monotonic() + self.ttl, value)
+
+    # Removes cached values of specified table (or all values if table is not specified).
+    # Returns amount of removed values
+    def invalidate(
+            self,
+            schema: str | None = None,
+            table_name: str | None = None,
+    ) -> int:
+        if schema is None and table_name is None:
+            invalidated = len(self._items)
+            self._items.clear()
+            return invalidated
+
+        keys = [
+            key
+            for key in self._items
+            if (schema is None or key[0] == schema) and (table_name is None or key[1] == table_name)
+        ]
+        for key in keys:
+            del self._items[key]
+
+        return len(keys)
+
+    def get_stats(self) -> dict[str, int | float]:
+        requests_amount = self.hits + self.misses
+        return {
+            'size': len(self._items),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / requests_amount if requests_amount > 0 else 0.0,
+        }
+
+
+metadata_cache = MetadataCache(
+    ttl=settings.cache.metadata_ttl,
+)
@@ -0,0 +1,196 @@
+import os
+import time
+from typing import Iterator, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from prometheus_client import Histogram, REGISTRY, CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST, \
+    multiprocess
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from consts import PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE
+from cron import get_cron_cache_stats
+from metadata_cache import metadata_cache
+from profiler import statement_listeners
+from request_context import RequestStats, get_request_stats
+from single_flight import datasource_single_flight
+from statement_cache import statement_cache
+
+# Label value for requests and statements not related to any table
+NO_TABLE_LABEL = ""
+# Label value for requests which don't match any route, so paths of such requests don't create new label values
+UNMATCHED_ROUTE_LABEL = "unmatched"
+
+ROWS_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+REQUEST_DURATION = Histogram(
+    "proplum_http_request_duration_seconds",
+    "Time of processing http requests",
+    ["method", "route", "table_name", "status"],
+)
+REQUEST_DB_DURATION = Histogram(
+    "proplum_http_request_db_duration_seconds",
+    "Total time of sql statements executed while processing http request",
+    ["route", "table_name"],
+)
+DB_STATEMENT_DURATION = Histogram(
+    "proplum_db_statement_duration_seconds",
+    "Time of executing sql statements",
+    ["operation"],
+)
+ROWS_RETURNED = Histogram(
+    "proplum_rows_returned",
+    "Amount of table rows returned by http request",
+    ["route", "table_name"],
+    buckets=ROWS_BUCKETS,
+)
+ROWS_WRITTEN = Histogram(
+    "proplum_rows_written",
+    "Amount of table rows inserted, updated or deleted by http request",
+    ["route", "table_name"],
+    buckets=ROWS_BUCKETS,
+)
+
+
+# Collector of connections pool and caches state, created when metrics are set up
+state_collector: Optional[Collector] = None
+
+
+# Collects values of gauges at the moment of scraping: state of connections pool and caches hit ratios
+class StateCollector(Collector):
+    def __init__(
+            self,
+            engine: AsyncEngine,
+    ) -> None:
+        self.engine = engine
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        pool = self.engine.pool
+
+        # Pool of async engine is always queue pool, overflow is negative while pool isn't filled
+        yield GaugeMetricFamily("proplum_db_pool_size", "Size of database connections pool", value=pool.size())
+        yield GaugeMetricFamily(
+            "proplum_db_pool_checked_out",
+            "Amount of database connections in use",
+            value=pool.checkedout(),
+        )
+        yield GaugeMetricFamily(
+            "proplum_db_pool_checked_in",
+            "Amount of idle database connections in pool",
+            value=pool.checkedin(),
+        )
+        yield GaugeMetricFamily(
+            "proplum_db_pool_overflow",
+            "Amount of database connections opened over pool size",
+            value=max(pool.overflow(), 0),
+        )
+
+        caches_stats = {
+            "metadata": metadata_cache.get_stats(),
+            "statements": statement_cache.get_stats(),
+            "cron": get_cron_cache_stats(),
+            "data": datasource_single_flight.get_stats(),
+        }
+        hit_ratio = GaugeMetricFamily(
+            "proplum_cache_hit_ratio",
+            "Ratio of in-process cache hits to all cache requests",
+            labels=["cache"],
+        )
+        size = GaugeMetricFamily(
+            "proplum_cache_size",
+            "Amount of entries in in-process cache",
+            labels=["cache"],
+        )
+        for cache_name, cache_stats in caches_stats.items():
+            hit_ratio.add_metric([cache_name], cache_stats["hit_ratio"])
+            size.add_metric([cache_name], cache_stats["size"])
+        yield hit_ratio
+        yield size
+
+
+def observe_statement_duration(
+        operation: str,
+        duration: float,
+):
+    DB_STATEMENT_DURATION.labels(operation).observe(duration)
+
+
+# ASGI middleware measuring time of requests. Route template is used as label instead of path, table name and time of
+# sql statements are taken from statistics of request (table name is set when availability of table is checked).
+# Should be added inside of request context middleware
+class MetricsMiddleware:
+    def __init__(
+            self,
+            app: ASGIApp,
+    ) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = get_request_stats() or RequestStats()
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+
+            route = scope.get("route")
+            route_label = route.path if route is not None else UNMATCHED_ROUTE_LABEL
+            table_label = stats.table_name or NO_TABLE_LABEL
+
+            REQUEST_DURATION.labels(scope["method"], route_label, table_label, str(status_code)).observe(duration)
+            REQUEST_DB_DURATION.labels(route_label, table_label).observe(stats.db_time)
+            if stats.rows_returned > 0:
+                ROWS_RETURNED.labels(route_label, table_label).observe(stats.rows_returned)
+            if stats.rows_written > 0:
+                ROWS_WRITTEN.labels(route_label, table_label).observe(stats.rows_written)
+
+
+async def metrics_endpoint() -> Response:
+    return Response(
+        content=generate_latest(get_metrics_registry()),
+        media_type=CONTENT_TYPE_LATEST,
+    )
+
+
+# When server is started with several worker processes, metrics of all workers are read from shared directory.
+# State of connections pool and caches is collected only from worker which processes request
+def get_metrics_registry() -> CollectorRegistry:
+    if PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    if state_collector is not None:
+        registry.register(state_collector)
+    return registry
+
+
+# Adds metrics collection to application and database engine and exposes metrics for Prometheus
+def setup_metrics(
+        app: FastAPI,
+        engine: AsyncEngine,
+        path: str,
+):
+    global state_collector
+
+    statement_listeners.append(observe_statement_duration)
+    state_collector = StateCollector(engine)
+    if PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE not in os.environ:
+        REGISTRY.register(state_collector)
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route(path, metrics_endpoint, methods=["GET"], include_in_schema=False)
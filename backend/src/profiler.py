@@ -0,0 +1,110 @@
+import logging
+import time
+from typing import Any, Callable, List, Mapping, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from consts import CATALOG_STATEMENT_OPERATION
+from request_context import add_request_statement, get_request_stats
+
+logger = logging.getLogger(__name__)
+
+# Functions called after execution of each sql statement with its operation and duration in seconds
+statement_listeners: List[Callable[[str, float], None]] = []
+
+
+# Measures time of each sql statement executed by engine, adds it to statistics of current request and logs statements
+# executed longer than threshold (in seconds, 0 disables logging)
+def instrument_engine(
+        engine: AsyncEngine,
+        slow_query_threshold: float,
+):
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        operation = get_statement_operation(statement)
+
+        add_request_statement(operation, duration)
+        for listener in statement_listeners:
+            listener(operation, duration)
+
+        if 0 < slow_query_threshold <= duration:
+            log_slow_query(statement, parameters, executemany, duration)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        if exception_context.connection is None:
+            return
+
+        start_times = exception_context.connection.info.get("query_start_time")
+        if start_times:
+            start_times.pop()
+
+
+# Returns first keyword of sql statement, so statements can be grouped without high cardinality of labels. Reads of
+# system catalogs (columns metadata, statistics of tables) are separated from reads of tables data
+def get_statement_operation(
+        statement: str,
+) -> str:
+    words = statement.lstrip(" (\n\t").split(None, 1)
+    if len(words) == 0:
+        return "other"
+
+    operation = words[0].lower()
+    if operation == "select" and ("information_schema." in statement or "pg_catalog." in statement):
+        return CATALOG_STATEMENT_OPERATION
+    if operation in ("select", "insert", "update", "delete", "with", "explain", "set", "show"):
+        return operation
+    return "other"
+
+
+# Returns type (and length for sized values) of parameter, so values of parameters are not written to log
+def get_parameter_shape(
+        value: Any,
+) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes, list, tuple, dict)):
+        return f"{type(value).__name__}({len(value)})"
+    return type(value).__name__
+
+
+def get_parameters_shape(
+        parameters: Mapping[str, Any] | Sequence[Any] | None,
+) -> str:
+    if parameters is None:
+        return "[]"
+    if isinstance(parameters, Mapping):
+        return "{" + ", ".join(f"{name}: {get_parameter_shape(value)}" for name, value in parameters.items()) + "}"
+    return "[" + ", ".join(get_parameter_shape(value) for value in parameters) + "]"
+
+
+def log_slow_query(
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        duration: float,
+):
+    parameters_shape: str
+    if executemany:
+        parameters_shape = f"{len(parameters)} x {get_parameters_shape(parameters[0] if parameters else None)}"
+    else:
+        parameters_shape = get_parameters_shape(parameters)
+
+    stats = get_request_stats()
+    table_name = stats.table_name if stats is not None else None
+
+    logger.warning(
+        "Slow query (%.3f s, table: %s): %s; parameters: %s",
+        duration,
+        table_name,
+        " ".join(statement.split()),
+        parameters_shape,
+    )
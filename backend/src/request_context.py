@@ -0,0 +1,123 @@
+import time
+from contextvars import ContextVar
+from typing import Optional, List
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from consts import CATALOG_STATEMENT_OPERATION
+
+
+# Statistics collected while processing one request
+class RequestStats:
+    def __init__(self) -> None:
+        self.start_time: float = time.perf_counter()
+        # Table which data is processed by request (if any)
+        self.table_name: Optional[str] = None
+        # Operation and duration in seconds of each executed sql statement
+        self.statements: List[tuple[str, float]] = []
+        # Total time of executed sql statements in seconds
+        self.db_time: float = 0.0
+        # Total time of rendering response content in seconds
+        self.serialization_time: float = 0.0
+        self.rows_returned: int = 0
+        self.rows_written: int = 0
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+# Returns statistics of current request or None if code is executed outside of request
+def get_request_stats() -> Optional[RequestStats]:
+    return request_stats.get()
+
+
+def set_request_table_name(
+        table_name: str,
+):
+    stats = request_stats.get()
+    if stats is not None:
+        stats.table_name = table_name
+
+
+def add_request_statement(
+        operation: str,
+        duration: float,
+):
+    stats = request_stats.get()
+    if stats is not None:
+        stats.statements.append((operation, duration))
+        stats.db_time += duration
+
+
+def add_request_serialization_time(
+        duration: float,
+):
+    stats = request_stats.get()
+    if stats is not None:
+        stats.serialization_time += duration
+
+
+def add_request_rows_returned(
+        rows_amount: int,
+):
+    stats = request_stats.get()
+    if stats is not None:
+        stats.rows_returned += rows_amount
+
+
+def add_request_rows_written(
+        rows_amount: int,
+):
+    stats = request_stats.get()
+    if stats is not None and rows_amount > 0:
+        stats.rows_written += rows_amount
+
+
+# Returns value of Server-Timing header with time (in milliseconds) of reading system catalogs, other sql statements,
+# serialization and whole request
+def get_server_timing_header(
+        stats: RequestStats,
+) -> str:
+    catalog_durations = [duration for operation, duration in stats.statements if operation == CATALOG_STATEMENT_OPERATION]
+    catalog_time = sum(catalog_durations)
+    total_time = time.perf_counter() - stats.start_time
+
+    return ", ".join([
+        f'catalog;desc="{len(catalog_durations)} statements";dur={catalog_time * 1000:.1f}',
+        f'db;desc="{len(stats.statements) - len(catalog_durations)} statements";'
+        f'dur={(stats.db_time - catalog_time) * 1000:.1f}',
+        f"serialize;dur={stats.serialization_time * 1000:.1f}",
+        f"total;dur={total_time * 1000:.1f}",
+    ])
+
+
+# ASGI middleware which creates statistics of each request. Optionally adds Server-Timing header to responses, so
+# the time breakdown is shown in browser devtools
+class RequestContextMiddleware:
+    def __init__(
+            self,
+            app: ASGIApp,
+            server_timing: bool = False,
+    ) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if self.server_timing and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", get_server_timing_header(stats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_stats.reset(token)
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+
+class CacheStatsRead(BaseModel):
+    size: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class StatementCacheStatsRead(CacheStatsRead):
+    max_size: int
+    evictions: int
+
+
+class SingleFlightStatsRead(CacheStatsRead):
+    coalesced: int
+
+
+class CachesStatsRead(BaseModel):
+    metadata: CacheStatsRead
+    statements: StatementCacheStatsRead
+    cron: CacheStatsRead
+    data: SingleFlightStatsRead
+
+
+class InvalidateCacheResponse(BaseModel):
+    invalidated: int
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Any, List, Mapping, Optional
+
+from pydantic import BaseModel
+
+
+class ChainSchedulePreviewRead(BaseModel):
+    # Primary key column name -> value of chain row
+    key: Mapping[str, Any]
+    schedule: Optional[str]
+    next_runs: List[datetime]
+    error: Optional[str] = None
+
+
+class ChainsSchedulePreviewRead(BaseModel):
+    schedules: List[ChainSchedulePreviewRead]
@@ -2,10 +2,12 @@ from datetime import timedelta
 from enum import Enum
 from typing import Mapping, Any, List, Optional, Annotated
 
-from pydantic import BaseModel, ConfigDict, WrapSerializer
+from pydantic import BaseModel, ConfigDict, Field, WrapSerializer
 from pydantic_core.core_schema import SerializerFunctionWrapHandler
 
+from enums import FilterOperator
 from schemas.datasource_column import DatasourceColumnRead
+from serialization import format_timedelta
 
 
 class DatasourceBase(BaseModel):
@@ -23,17 +25,49 @@ class OrderByValues(str, Enum):
     DESC = "DESC"
 
 
+class PaginationMode(str, Enum):
+    # Page is defined by skip and limit
+    OFFSET = "offset"
+    # Page starts after row pointed by cursor, so reading of far pages is as fast as reading of first page
+    KEYSET = "keyset"
+
+
+class TotalMode(str, Enum):
+    # Total amount of rows is not calculated
+    NONE = "none"
+    # Exact amount of rows matching filters (count(*))
+    EXACT = "exact"
+    # Planner estimation of amount of rows, which is cheap for big tables
+    ESTIMATED = "estimated"
+
+
+class DatasourceFilter(BaseModel):
+    op: FilterOperator
+    # Value for eq, prefix, contains and full_text operators
+    value: Any = None
+    # Values for in operator
+    values: Optional[List[Any]] = None
+    # Bounds for range operator
+    start: Any = None
+    end: Any = None
+
+
 class DatasourceDataReadInput(BaseModel):
-    # Column name -> Filter column value
-    filters: Mapping[str, str | int] | None = None
+    # Column name -> Filter column value (operator is chosen by column type) or filter with explicit operator
+    filters: Mapping[str, str | int | DatasourceFilter] | None = None
     # Column name -> 'ASC' or 'DESC'
     order_by: Mapping[str, OrderByValues] | None = None
+    pagination: PaginationMode = PaginationMode.OFFSET
+    # Cursor from previous page response (used only with keyset pagination)
+    cursor: Optional[str] = None
+    total: TotalMode = TotalMode.NONE
+    # Names of columns that should be read (all columns if not specified)
+    columns: Optional[List[str]] = Field(None, min_length=1)
 
 
 def serialize_extra_fields(v: Any, handler: SerializerFunctionWrapHandler) -> Any:
     if isinstance(v, timedelta):
-        # Return timedelta value in human-readable form (instead of something like "P1D")
-        return str(v).replace(", 0:00:00", "")
+        return format_timedelta(v)
     return handler(v)
 
 
@@ -55,6 +89,15 @@ class DataRow(BaseModel):
 class DatasourceDataWithColumnsRead(BaseModel):
     data: List[DataRow]
     columns: Optional[List[DatasourceColumnRead]] = None
+    # Cursor for getting next page with keyset pagination
+    next_cursor: Optional[str] = None
+    # Amount of rows matching filters (if requested)
+    total: Optional[int] = None
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
 
 
 class DatasourceDataWrite(BaseModel):
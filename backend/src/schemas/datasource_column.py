@@ -1,4 +1,5 @@
-from typing import List
+from enum import Enum
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -15,5 +16,14 @@ class DatasourceColumnRead(DatasourceColumnBase):
     pass
 
 
+class ValuesSearchMode(str, Enum):
+    # Values starting with search string (case-sensitive, so index of value column can be used)
+    PREFIX = "prefix"
+    # Values containing search string (case-insensitive)
+    CONTAINS = "contains"
+
+
 class DatasourceColumnValuesRead:
     values: List[DatasourceColumnValue]
+    # Cursor of next page of values. Returned only if limit is set
+    next_cursor: Optional[str]
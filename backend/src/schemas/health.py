@@ -0,0 +1,23 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class HealthRead(BaseModel):
+    status: str
+
+
+class PoolStatusRead(BaseModel):
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    saturation: float
+
+
+class ReadinessRead(BaseModel):
+    status: str
+    database: bool
+    error: Optional[str] = None
+    pool: PoolStatusRead
@@ -1,10 +1,11 @@
-from typing import Optional
+from enum import Enum
+from typing import Optional, List
 
 from pydantic import BaseModel, Field
 
 
-class GenerateLoadInfoInput(BaseModel):
-    object_id: int
+# Parameters of load generation, which can be shared by several objects
+class GenerateLoadInfoParams(BaseModel):
     start_extr: Optional[str] = Field(None)
     end_extr: Optional[str] = Field(None)
     extraction_type: Optional[str] = Field(None)
@@ -15,5 +16,37 @@ class GenerateLoadInfoInput(BaseModel):
     end_load: Optional[str] = Field(None)
 
 
+class GenerateLoadInfoInput(GenerateLoadInfoParams):
+    object_id: int
+
+
 class GenerateLoadInfoResponse(BaseModel):
     load_info_id: int | None
+
+
+class BulkGenerationMode(str, Enum):
+    # Loads of all objects are generated in one transaction, each object in its own savepoint
+    TRANSACTION = "transaction"
+    # Loads of objects are generated concurrently in separate sessions (amount of sessions is limited)
+    PARALLEL = "parallel"
+
+
+class GenerateLoadInfoBulkInput(BaseModel):
+    # Parameters for each object
+    items: Optional[List[GenerateLoadInfoInput]] = None
+    # Load group which objects are used, if items aren't set. Parameters are shared by all objects of group
+    load_group: Optional[str] = None
+    params: GenerateLoadInfoParams = GenerateLoadInfoParams()
+    # Use only active objects of load group
+    only_active: bool = True
+    mode: BulkGenerationMode = BulkGenerationMode.TRANSACTION
+
+
+class GenerateLoadInfoResult(BaseModel):
+    object_id: int
+    load_info_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class GenerateLoadInfoBulkResponse(BaseModel):
+    results: List[GenerateLoadInfoResult]
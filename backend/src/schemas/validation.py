@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List
 
 from pydantic import BaseModel
 
@@ -12,3 +12,12 @@ class ValidateValueInput(BaseModel):
 
 class ValidateValueResponse(BaseModel):
     error: str | None
+
+
+class ValidateValuesInput(BaseModel):
+    values: List[ValidateValueInput]
+
+
+class ValidateValuesResponse(BaseModel):
+    # Error message (or None) for each value in order of input values
+    errors: List[str | None]
@@ -0,0 +1,122 @@
+import csv
+import io
+import time
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Mapping, Sequence, Iterable
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from request_context import add_request_serialization_time
+
+
+# Returns timedelta value in human-readable form (instead of something like "P1D")
+def format_timedelta(
+        value: timedelta,
+) -> str:
+    return str(value).replace(", 0:00:00", "")
+
+
+# Used by orjson for types it can't serialize by itself. Values are formatted the same way as pydantic does
+# in response models
+def orjson_default(
+        value: Any,
+) -> Any:
+    if isinstance(value, timedelta):
+        return format_timedelta(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    # Rows of query results
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, bytes):
+        return value.decode()
+
+    raise TypeError
+
+
+# Response which serializes rows of query results straight to JSON without validating them by pydantic models
+# Measures time of rendering content, so it's shown in statistics of request
+class TimedORJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        start_time = time.perf_counter()
+        body = self.dumps(content)
+        add_request_serialization_time(time.perf_counter() - start_time)
+        return body
+
+    def dumps(self, content: Any) -> bytes:
+        return super().render(content)
+
+
+class FastORJSONResponse(TimedORJSONResponse):
+    def dumps(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+        )
+
+
+# Rows shared by several responses (coalesced reads). They are serialized once and embedded to each response as is
+class SharedRows(list):
+    fragment: orjson.Fragment | None = None
+
+    def get_fragment(self) -> orjson.Fragment:
+        start_time = time.perf_counter()
+        if self.fragment is None:
+            self.fragment = orjson.Fragment(orjson.dumps(
+                self,
+                default=orjson_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+            ))
+        add_request_serialization_time(time.perf_counter() - start_time)
+        return self.fragment
+
+
+# Returns rows as bytes with JSON object on each line
+def serialize_rows_to_ndjson(
+        rows: Iterable[Mapping[str, Any]],
+) -> bytes:
+    return b"".join([
+        orjson.dumps(dict(row), default=orjson_default, option=orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    ])
+
+
+# Returns Server-Sent Event with rows as JSON array. Client reconnects from event id after connection is lost
+def serialize_rows_to_sse_event(
+        rows: Sequence[Mapping[str, Any]],
+        event_id: str,
+) -> bytes:
+    return b"id: " + event_id.encode() + b"\nevent: rows\ndata: " + orjson.dumps(rows, default=orjson_default) + b"\n\n"
+
+
+def format_csv_value(
+        value: Any,
+) -> Any:
+    if isinstance(value, timedelta):
+        return format_timedelta(value)
+    if isinstance(value, (list, dict)):
+        return orjson.dumps(value, default=orjson_default).decode()
+
+    return value
+
+
+# Returns rows as CSV text (optionally with header line)
+def serialize_rows_to_csv(
+        rows: Iterable[Sequence[Any]],
+        header: Sequence[str] | None = None,
+) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if header is not None:
+        writer.writerow(header)
+
+    writer.writerows([
+        [format_csv_value(value) for value in row]
+        for row in rows
+    ])
+
+    return buffer.getvalue()
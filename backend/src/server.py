@@ -0,0 +1,97 @@
+import glob
+import importlib.util
+import os
+import shutil
+import tempfile
+
+import uvicorn
+
+from config import settings
+from consts import PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE
+
+
+# Returns sizes of connections pool (pool size, max overflow) of each worker, so all workers together don't open more
+# connections than budget. Ratio of configured pool size to max overflow is kept
+def get_worker_pool_sizes(
+        connections_budget: int,
+        workers: int,
+        pool_size: int,
+        max_overflow: int,
+) -> tuple[int, int]:
+    worker_connections = max(connections_budget // workers, 1)
+    if pool_size + max_overflow <= worker_connections:
+        return pool_size, max_overflow
+
+    worker_pool_size = max(worker_connections * pool_size // (pool_size + max_overflow), 1)
+    return worker_pool_size, max(worker_connections - worker_pool_size, 0)
+
+
+# Sets environment variables which are read by settings of worker processes. Returns temporary directory created for
+# metrics, which should be removed after stopping server
+def prepare_workers_environment(
+        workers: int,
+) -> str | None:
+    # Without budget all workers together open not more connections than one process with configured pool, so
+    # starting several workers doesn't exhaust connections limit of database
+    connections_budget = settings.run.db_connections_budget
+    if connections_budget is None and workers > 1:
+        connections_budget = settings.db.pool_size + settings.db.max_overflow
+
+    if connections_budget is not None:
+        pool_size, max_overflow = get_worker_pool_sizes(
+            connections_budget=connections_budget,
+            workers=workers,
+            pool_size=settings.db.pool_size,
+            max_overflow=settings.db.max_overflow,
+        )
+        os.environ["APP_CONFIG__DB__POOL_SIZE"] = str(pool_size)
+        os.environ["APP_CONFIG__DB__MAX_OVERFLOW"] = str(max_overflow)
+        print(f"Database connections pool of each worker: pool size {pool_size}, max overflow {max_overflow}")
+
+    # Job can be polled by request to any worker, so states of jobs are shared between workers through journal
+    if workers > 1 and settings.jobs.journal_path is None:
+        journal_path = os.path.join(tempfile.gettempdir(), "proplum_jobs.jsonl")
+        os.environ["APP_CONFIG__JOBS__JOURNAL_PATH"] = journal_path
+        print(f"Journal of background jobs: {journal_path}")
+
+    # Each worker process has its own metrics, so they are written to shared directory
+    if workers > 1 and settings.metrics.enabled:
+        directory = os.environ.get(PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE)
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="proplum_metrics_")
+            os.environ[PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE] = directory
+            return directory
+
+        # Metrics of processes from previous run shouldn't be added to new ones
+        os.makedirs(directory, exist_ok=True)
+        for file_path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(file_path)
+
+    return None
+
+
+# Production entry point: several worker processes without reload. Active requests are finished after shutdown signal
+# during graceful shutdown timeout, then lifespan handler of each worker closes database connections
+def run():
+    workers = max(settings.run.workers, 1)
+    temporary_metrics_directory = prepare_workers_environment(workers)
+
+    try:
+        uvicorn.run(
+            "main:main_app",
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            host=settings.run.host,
+            port=settings.run.port,
+            workers=workers,
+            loop="uvloop" if importlib.util.find_spec("uvloop") is not None else "asyncio",
+            http="httptools" if importlib.util.find_spec("httptools") is not None else "h11",
+            timeout_graceful_shutdown=settings.run.graceful_shutdown_timeout,
+            proxy_headers=True,
+        )
+    finally:
+        if temporary_metrics_directory is not None:
+            shutil.rmtree(temporary_metrics_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from config import settings
+
+
+# Coalesces identical concurrent reads: the first caller starts execution, callers with the same key wait for its
+# result instead of executing the same query again. Execution runs in separate task, so cancellation of the first
+# caller (closed connection of client) doesn't affect others. Results can be kept for a short time (micro-cache),
+# so reads right after execution are coalesced too. Keys are tuples starting with table_name.
+class SingleFlight:
+    def __init__(
+            self,
+            ttl: float,
+            max_size: int,
+    ) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        # Results taken from micro-cache
+        self.hits = 0
+        # Results of executions started by other callers
+        self.coalesced = 0
+        self.misses = 0
+        self._flights: dict[tuple[Hashable, ...], asyncio.Task] = {}
+        # Key -> (expiration time, result)
+        self._results: OrderedDict[tuple[Hashable, ...], tuple[float, Any]] = OrderedDict()
+
+    # before_wait is called when result isn't cached and caller waits for execution, e.g. to release connection of
+    # caller, so waiting callers don't hold connections needed by execution
+    async def run(
+            self,
+            key: tuple[Hashable, ...],
+            func: Callable[[], Awaitable[Any]],
+            before_wait: Callable[[], Awaitable[Any]] | None = None,
+    ) -> Any:
+        item = self._results.get(key)
+        if item is not None:
+            expires_at, result = item
+            if expires_at > time.monotonic():
+                self.hits += 1
+                return result
+
+            del self._results[key]
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            flight = asyncio.create_task(func())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda task: self._finish_flight(key, task))
+
+        if before_wait is not None:
+            await before_wait()
+        return await asyncio.shield(flight)
+
+    def _finish_flight(
+            self,
+            key: tuple[Hashable, ...],
+            flight: asyncio.Task,
+    ):
+        # Flight is missing if it was invalidated during execution, so its result can be outdated
+        if self._flights.get(key) is not flight:
+            return
+        del self._flights[key]
+
+        if self.ttl <= 0 or self.max_size <= 0 or flight.cancelled() or flight.exception() is not None:
+            return
+
+        self._results[key] = (time.monotonic() + self.ttl, flight.result())
+        self._results.move_to_end(key)
+        if len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    # Removes results of specified table (or all results if table is not specified), so data changes are read at once.
+    # Returns amount of removed results
+    def invalidate(
+            self,
+            table_name: str | None = None,
+    ) -> int:
+        if table_name is None:
+            invalidated = len(self._results)
+            self._results.clear()
+            self._flights.clear()
+            return invalidated
+
+        keys = [key for key in self._results if key[0] == table_name]
+        for key in keys:
+            del self._results[key]
+        for key in [key for key in self._flights if key[0] == table_name]:
+            del self._flights[key]
+
+        return len(keys)
+
+    def get_stats(self) -> dict[str, int | float]:
+        requests_amount = self.hits + self.coalesced + self.misses
+        return {
+            'size': len(self._results),
+            'hits': self.hits,
+            'coalesced': self.coalesced,
+            'misses': self.misses,
+            'hit_ratio': (self.hits + self.coalesced) / requests_amount if requests_amount > 0 else 0.0,
+        }
+
+
+datasource_single_flight = SingleFlight(
+    ttl=settings.cache.data_ttl,
+    max_size=settings.cache.data_cache_size,
+)
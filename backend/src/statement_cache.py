@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Sequence
+
+from sqlalchemy import BindParameter, bindparam, TextClause
+from sqlalchemy.sql import text
+
+from config import settings
+
+
+# LRU cache of dynamically built sql statements. Statements of the same shape (table, operation, columns, filters
+# and etc.) are reused with different parameters values, so SQLAlchemy doesn't compile them again and database driver
+# can reuse prepared statements
+class StatementCache:
+    def __init__(
+            self,
+            max_size: int,
+    ) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._statements: OrderedDict[tuple[Hashable, ...], TextClause] = OrderedDict()
+
+    # Returns statement without values of bind params and dict with values for its execution
+    def get_statement(
+            self,
+            table_name: str,
+            operation: str,
+            sql: str,
+            bind_params: Sequence[BindParameter],
+    ) -> tuple[TextClause, dict[str, Any]]:
+        params = {
+            bind_param.key: bind_param.value
+            for bind_param in bind_params
+        }
+
+        # Text of statement already describes its shape: names of columns, filters, ordering, params names and etc.
+        key = (table_name, operation, sql)
+        statement = self._statements.get(key)
+        if statement is not None:
+            self.hits += 1
+            self._statements.move_to_end(key)
+            return statement, params
+
+        self.misses += 1
+        statement = text(sql).bindparams(*[
+            bindparam(bind_param.key, type_=bind_param.type)
+            for bind_param in bind_params
+        ])
+
+        if self.max_size > 0:
+            self._statements[key] = statement
+            if len(self._statements) > self.max_size:
+                self._statements.popitem(last=False)
+                self.evictions += 1
+
+        return statement, params
+
+    def clear(self) -> int:
+        cleared = len(self._statements)
+        self._statements.clear()
+        return cleared
+
+    def get_stats(self) -> dict[str, int | float]:
+        requests_amount = self.hits + self.misses
+        return {
+            'size': len(self._statements),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / requests_amount if requests_amount > 0 else 0.0,
+        }
+
+
+statement_cache = StatementCache(
+    max_size=settings.cache.statement_cache_size,
+)
@@ -0,0 +1,276 @@
+import asyncio
+import logging
+from typing import Any, AsyncGenerator, Mapping, Optional, Sequence
+
+import orjson
+
+from config import settings
+from crud import datasource as datasource_crud
+from db_helper import db_helper
+from serialization import orjson_default, serialize_rows_to_sse_event
+from utils import encode_cursor, decode_cursor, get_cursor_value
+
+logger = logging.getLogger(__name__)
+
+# Comment sent to client when there are no new rows, so proxies don't close idle connection
+SSE_HEARTBEAT = b": ping\n\n"
+
+
+# Rows of tail are identified by their values, so rows read again in lookback window aren't sent twice
+def get_tail_row_key(
+        row: Mapping[str, Any],
+) -> int:
+    return hash(orjson.dumps(list(row.values()), default=orjson_default))
+
+
+# Reads rows of table added or changed after cursor. Rows can be committed in other order than values of tail column
+# are generated (e.g. ids of sequence or time of transaction start), so the last rows before cursor (lookback window)
+# are read again and rows, which weren't read by previous read, are returned as new ones. Rows committed behind
+# lookback window are missed, so live tail is best-effort for long transactions
+class TailReader:
+    def __init__(
+            self,
+            table_name: str,
+            column_name: str,
+            cursor: str,
+    ) -> None:
+        self.table_name = table_name
+        self.column_name = column_name
+        self.cursor = cursor
+        # Keys of rows of the previous read. Before the first read rows of lookback window are considered already seen
+        self.seen_keys: Optional[set[int]] = None
+
+    # Returns new rows and whether there can be more of them, which don't fit in one read
+    async def read(self) -> tuple[list[Mapping[str, Any]], bool]:
+        rows = await read_tail_rows(self.table_name, self.column_name, self.cursor)
+        cursor_value = decode_cursor(self.cursor, [(self.column_name, "asc")])[0]
+
+        keys = [get_tail_row_key(row) for row in rows]
+        new_rows = [
+            row
+            for row, key in zip(rows, keys)
+            if (
+                key not in self.seen_keys
+                if self.seen_keys is not None
+                else is_tail_row_after(row, self.column_name, cursor_value)
+            )
+        ]
+        rows_after_cursor = sum(1 for row in rows if is_tail_row_after(row, self.column_name, cursor_value))
+
+        if len(rows) > 0:
+            self.cursor = encode_cursor([(self.column_name, "asc")], rows[-1])
+        self.seen_keys = set(keys)
+        return new_rows, rows_after_cursor >= settings.tail.max_rows
+
+
+# Tail columns are numbers or timestamps without time zone, which cursor values (ISO strings for timestamps) are
+# ordered the same way as values themselves
+def is_tail_row_after(
+        row: Mapping[str, Any],
+        column_name: str,
+        cursor_value: Any,
+) -> bool:
+    return cursor_value is None or get_cursor_value(row[column_name]) > cursor_value
+
+
+# Batch of new rows read by poller. Event is serialized once and sent to all clients, which haven't seen these rows
+class TailBatch:
+    def __init__(
+            self,
+            rows: Sequence[Mapping[str, Any]],
+            event_id: str,
+    ) -> None:
+        self.rows = rows
+        self.keys = [get_tail_row_key(row) for row in rows]
+        self.event_id = event_id
+        self.event = serialize_rows_to_sse_event(rows, event_id)
+
+
+# Batches of poller can contain rows, which client has already read by itself after subscription, so they're skipped
+class TailSubscriber:
+    def __init__(
+            self,
+            queue_size: int,
+    ) -> None:
+        self.queue: asyncio.Queue[Optional[TailBatch]] = asyncio.Queue(maxsize=queue_size)
+        # Keys of rows of the last read of client
+        self.seen_keys: set[int] = set()
+
+    # Returns event with rows of batch, which client hasn't seen yet, or None if client has seen all of them
+    def get_batch_event(
+            self,
+            batch: TailBatch,
+    ) -> Optional[bytes]:
+        rows = [row for row, key in zip(batch.rows, batch.keys) if key not in self.seen_keys]
+        if len(rows) == len(batch.rows):
+            return batch.event
+        if len(rows) == 0:
+            return None
+
+        return serialize_rows_to_sse_event(rows, batch.event_id)
+
+
+# Checks table for new rows and sends them to all subscribed clients, so amount of queries doesn't depend on amount
+# of clients. Poller is stopped when there are no subscribers
+class TailPoller:
+    def __init__(
+            self,
+            table_name: str,
+            column_name: str,
+            cursor: str,
+    ) -> None:
+        self.reader = TailReader(table_name=table_name, column_name=column_name, cursor=cursor)
+        self.subscribers: set[TailSubscriber] = set()
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        while len(self.subscribers) > 0:
+            await asyncio.sleep(settings.tail.poll_interval)
+
+            # Rows are read by pages until all new rows are sent
+            while True:
+                try:
+                    rows, has_more_rows = await self.reader.read()
+                except Exception:
+                    logger.exception("Can't read new rows of table %s for live tail", self.reader.table_name)
+                    break
+
+                if len(rows) > 0:
+                    self.publish(TailBatch(rows, self.reader.cursor))
+                if not has_more_rows or len(self.subscribers) == 0:
+                    break
+
+    def publish(
+            self,
+            batch: TailBatch,
+    ):
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(batch)
+            except asyncio.QueueFull:
+                # Slow client is disconnected, it reconnects and reads missed rows from its last event id
+                self.subscribers.discard(subscriber)
+                close_subscriber(subscriber)
+
+
+# Keeps one poller for each table with subscribed clients
+class TailBroadcaster:
+    def __init__(self) -> None:
+        self.pollers: dict[tuple[str, str], TailPoller] = {}
+
+    def subscribe(
+            self,
+            table_name: str,
+            column_name: str,
+            cursor: str,
+    ) -> TailSubscriber:
+        subscriber = TailSubscriber(queue_size=settings.tail.queue_size)
+
+        poller = self.pollers.get((table_name, column_name))
+        if poller is None or poller.task is None or poller.task.done():
+            # Poller starts from cursor of the first client, rows before it are read by client itself
+            poller = TailPoller(table_name=table_name, column_name=column_name, cursor=cursor)
+            self.pollers[(table_name, column_name)] = poller
+            poller.subscribers.add(subscriber)
+            poller.start()
+        else:
+            poller.subscribers.add(subscriber)
+
+        return subscriber
+
+    def unsubscribe(
+            self,
+            table_name: str,
+            column_name: str,
+            subscriber: TailSubscriber,
+    ):
+        poller = self.pollers.get((table_name, column_name))
+        if poller is None:
+            return
+
+        poller.subscribers.discard(subscriber)
+        if len(poller.subscribers) == 0:
+            if poller.task is not None:
+                poller.task.cancel()
+            del self.pollers[(table_name, column_name)]
+
+    async def stop(self):
+        pollers = list(self.pollers.values())
+        self.pollers = {}
+        for poller in pollers:
+            for subscriber in poller.subscribers:
+                close_subscriber(subscriber)
+            poller.subscribers = set()
+            if poller.task is not None:
+                poller.task.cancel()
+        await asyncio.gather(*[poller.task for poller in pollers if poller.task is not None], return_exceptions=True)
+
+    # Yields Server-Sent Events with rows added or changed after row pointed by cursor. Client is subscribed before
+    # reading missed rows, so rows added meanwhile are received from poller (rows seen twice are skipped). Rows of
+    # lookback window before cursor of reconnecting client are considered seen by it
+    async def stream(
+            self,
+            table_name: str,
+            column_name: str,
+            cursor: str,
+    ) -> AsyncGenerator[bytes, None]:
+        subscriber = self.subscribe(table_name, column_name, cursor)
+        reader = TailReader(table_name=table_name, column_name=column_name, cursor=cursor)
+        try:
+            while True:
+                rows, has_more_rows = await reader.read()
+                subscriber.seen_keys = reader.seen_keys
+                if len(rows) > 0:
+                    yield serialize_rows_to_sse_event(rows, reader.cursor)
+
+                if not has_more_rows:
+                    break
+
+            while True:
+                try:
+                    batch = await asyncio.wait_for(subscriber.queue.get(), timeout=settings.tail.heartbeat_interval)
+                except TimeoutError:
+                    yield SSE_HEARTBEAT
+                    continue
+
+                if batch is None:
+                    return
+
+                event = subscriber.get_batch_event(batch)
+                if event is not None:
+                    yield event
+        finally:
+            self.unsubscribe(table_name, column_name, subscriber)
+
+
+# Stream of subscriber is finished after sending already queued rows
+def close_subscriber(
+        subscriber: TailSubscriber,
+):
+    if subscriber.queue.full():
+        subscriber.queue.get_nowait()
+    subscriber.queue.put_nowait(None)
+
+
+# Reads new rows of table in separate session, so connection isn't held by stream between checks
+async def read_tail_rows(
+        table_name: str,
+        column_name: str,
+        cursor: str,
+) -> Sequence[Mapping[str, Any]]:
+    session_factory = await db_helper.get_read_session_factory()
+    async with session_factory() as session:
+        return await datasource_crud.get_datasource_tail_data(
+            session=session,
+            table_name=table_name,
+            column_name=column_name,
+            cursor=cursor,
+            limit=settings.tail.max_rows,
+            lookback=settings.tail.lookback_rows,
+        )
+
+
+tail_broadcaster = TailBroadcaster()
@@ -1,36 +1,181 @@
+import base64
+import hashlib
 import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from uuid import UUID
 
-from typing import Mapping, List, Any
+import orjson
+from typing import Mapping, List, Any, Sequence, Iterator, TypeVar
 
 from sqlalchemy import bindparam, BindParameter
 from sqlalchemy.types import String
 from sqlalchemy.exc import DBAPIError
 
 from config import settings
-from consts import CLIENT_ALLOWED_DATABASE_NAMES, TABLE_COLUMN_VALIDATION_TYPE
-from enums import ColumnDataType
+from cron import is_valid_cron_expression
+from request_context import set_request_table_name
+from consts import CLIENT_ALLOWED_DATABASE_NAMES, TABLE_COLUMN_VALIDATION_TYPE, NUMERIC_DATA_TYPES, \
+    TEXT_DATA_TYPES
+from enums import ColumnDataType, FilterOperator
+from schemas.datasource import DatasourceFilter
 from schemas.datasource_column import DatasourceColumnBase
+from validators import validate_formatted_value_locally
 from fastapi import HTTPException
 from croniter import croniter
 
+T = TypeVar("T")
 
-def get_where_statement_by_filters(
-        filters: Mapping[str, str | int] | None,
+
+# Returns identifier quoted for usage in sql statement (column names can contain spaces and upper case letters)
+def quote_identifier(
+        identifier: str,
+) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+# Returns operator used for filter with plain value: numeric and boolean columns are compared by equality
+# (so indexes can be used), other columns are searched by substring
+def get_default_filter_operator(
+        value: Any,
+        data_type: str,
+) -> FilterOperator:
+    value_text = str(value).strip()
+
+    if data_type in NUMERIC_DATA_TYPES:
+        try:
+            float(value_text)
+            return FilterOperator.Eq
+        except ValueError:
+            return FilterOperator.Contains
+
+    if data_type == "boolean" and value_text.lower() in ("true", "false"):
+        return FilterOperator.Eq
+
+    return FilterOperator.Contains
+
+
+# Returns LIKE pattern which matches values starting with specified value
+def get_prefix_like_pattern(
+        value: Any,
+) -> str:
+    escaped_value = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped_value}%"
+
+
+def get_where_condition_by_filter(
+        field: str,
+        data_type: str,
+        filter_value: Any,
+        param_name: str,
+        bind_params: list[BindParameter[str]],
+) -> str:
+    column_sql = quote_identifier(field)
+
+    operator: FilterOperator
+    value: Any
+    if isinstance(filter_value, DatasourceFilter):
+        operator = filter_value.op
+        value = filter_value.value
+    else:
+        operator = get_default_filter_operator(filter_value, data_type)
+        value = filter_value
+
+    if operator == FilterOperator.IsNull:
+        return f"{column_sql} IS NULL"
+
+    if operator == FilterOperator.NotNull:
+        return f"{column_sql} IS NOT NULL"
+
+    if operator == FilterOperator.In:
+        values = filter_value.values if filter_value.values is not None else []
+        if len(values) == 0:
+            return "FALSE"
+
+        values_sql = [
+            get_column_value_sql_statement_and_add_bind_param(in_value, data_type, f"{param_name}_{i}", bind_params)
+            for i, in_value in enumerate(values)
+        ]
+        return f"{column_sql} IN ({', '.join(values_sql)})"
+
+    if operator == FilterOperator.Range:
+        range_conditions: list[str] = []
+        if filter_value.start is not None:
+            start_sql = get_column_value_sql_statement_and_add_bind_param(
+                filter_value.start, data_type, f"{param_name}_start", bind_params,
+            )
+            range_conditions.append(f"{column_sql} >= {start_sql}")
+        if filter_value.end is not None:
+            end_sql = get_column_value_sql_statement_and_add_bind_param(
+                filter_value.end, data_type, f"{param_name}_end", bind_params,
+            )
+            range_conditions.append(f"{column_sql} <= {end_sql}")
+
+        if len(range_conditions) == 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Filter of column \'{field}\' with operator \'range\' requires start or end",
+            )
+
+        return f"({' AND '.join(range_conditions)})"
+
+    if value is None:
+        if operator == FilterOperator.Eq:
+            return f"{column_sql} IS NULL"
+
+        raise HTTPException(
+            status_code=400,
+            detail=f"Filter of column \'{field}\' with operator \'{operator.value}\' requires value",
+        )
+
+    if operator == FilterOperator.Eq:
+        value_sql = get_column_value_sql_statement_and_add_bind_param(value, data_type, param_name, bind_params)
+        return f"{column_sql} = {value_sql}"
+
+    bind_params.append(bindparam(
+        param_name,
+        value=get_prefix_like_pattern(value) if operator == FilterOperator.Prefix else str(value),
+        type_=String,
+    ))
+
+    if operator == FilterOperator.Prefix:
+        # Text columns are compared without casting, so index on column can be used
+        prefix_column_sql = column_sql if data_type in TEXT_DATA_TYPES else f"CAST({column_sql} as TEXT)"
+        return f"{prefix_column_sql} LIKE :{param_name}"
+
+    if operator == FilterOperator.FullText:
+        return f"to_tsvector('simple', CAST({column_sql} as TEXT)) @@ plainto_tsquery('simple', :{param_name})"
+
+    return f"CAST({column_sql} as TEXT) ILIKE CONCAT('%', :{param_name}, '%')"
+
+
+def get_where_conditions_by_filters(
+        filters: Mapping[str, Any] | None,
         columns_dict: Mapping[str, str],
         bind_params: list[BindParameter[str]] | None,
-) -> str:
+) -> list[str]:
     if filters is None:
-        return ""
+        return []
 
     where_conditions: list[str] = []
-    for field, value in filters.items():
+    for i, (field, value) in enumerate(filters.items()):
         if field not in columns_dict:
             continue
 
-        param_name = f"{field}_value"
-        where_conditions.append(f"CAST({field} as TEXT) ILIKE CONCAT('%', :{param_name}, '%')")
-        bind_params.append(bindparam(param_name, value=str(value), type_=String))
+        where_conditions.append(get_where_condition_by_filter(
+            field,
+            columns_dict[field],
+            value,
+            f"filter_value_{i}",
+            bind_params,
+        ))
 
+    return where_conditions
+
+
+def get_where_statement_by_conditions(
+        where_conditions: list[str],
+) -> str:
     where_text: str
     if len(where_conditions) > 0:
         where_text = f"WHERE {' AND '.join(where_conditions)}"
@@ -40,6 +185,16 @@ def get_where_statement_by_filters(
     return where_text
 
 
+def get_where_statement_by_filters(
+        filters: Mapping[str, Any] | None,
+        columns_dict: Mapping[str, str],
+        bind_params: list[BindParameter[str]] | None,
+) -> str:
+    return get_where_statement_by_conditions(
+        get_where_conditions_by_filters(filters, columns_dict, bind_params)
+    )
+
+
 def get_order_by_statement_by_mapping(
         order_by: Mapping[str, str] | None,
         columns_dict: Mapping[str, str],
@@ -47,20 +202,122 @@ def get_order_by_statement_by_mapping(
     if order_by is None:
         return ""
 
-    fields_order_by: list[str] = []
+    fields_order_by: list[tuple[str, str]] = []
     for field, value in order_by.items():
         if field not in columns_dict:
             continue
 
-        fields_order_by.append(f"{field} DESC" if value.lower() == "desc" else f"{field} ASC")
+        fields_order_by.append((field, value))
 
-    order_by_text: str
-    if len(fields_order_by) > 0:
-        order_by_text = f"ORDER BY {', '.join(fields_order_by)}"
-    else:
-        order_by_text = ""
+    return get_order_by_statement_by_fields(fields_order_by)
+
+
+# Gets list of tuples (column name, 'ASC' or 'DESC') and returns ORDER BY statement
+def get_order_by_statement_by_fields(
+        fields_order_by: Sequence[tuple[str, str]],
+) -> str:
+    if len(fields_order_by) == 0:
+        return ""
+
+    return "ORDER BY " + ", ".join([
+        f"{quote_identifier(field)} DESC" if value.lower() == "desc" else f"{quote_identifier(field)} ASC"
+        for field, value in fields_order_by
+    ])
 
-    return order_by_text
+
+# Converts value of column from database to value that can be stored in JSON cursor and then
+# casted back to column type in sql statement
+def get_cursor_value(
+        value: Any,
+) -> Any:
+    if isinstance(value, timedelta):
+        return f"{value.total_seconds()} seconds"
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+
+    return value
+
+
+# Makes opaque cursor that points to the row after which next page of keyset pagination starts
+def encode_cursor(
+        keyset_order: Sequence[tuple[str, str]],
+        row: Mapping[str, Any],
+) -> str:
+    cursor_data = {
+        'order': [[column_name, direction] for column_name, direction in keyset_order],
+        'values': [get_cursor_value(row[column_name]) for column_name, _ in keyset_order],
+    }
+    return base64.urlsafe_b64encode(orjson.dumps(cursor_data)).decode()
+
+
+# Returns values of cursor columns and throws error if cursor is invalid or made for another ordering
+def decode_cursor(
+        cursor: str,
+        keyset_order: Sequence[tuple[str, str]],
+) -> list[Any]:
+    try:
+        cursor_data = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        cursor_order = [(column_name, direction) for column_name, direction in cursor_data['order']]
+        cursor_values = cursor_data['values']
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid cursor",
+        )
+
+    if cursor_order != list(keyset_order) or len(cursor_values) != len(keyset_order):
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor doesn't match current order of rows",
+        )
+
+    return cursor_values
+
+
+# Makes condition for rows which go after cursor in keyset ordering. Takes into account that NULL values go
+# last for ascending order and first for descending order (PostgreSQL default)
+def get_keyset_condition_by_cursor(
+        cursor: str,
+        keyset_order: Sequence[tuple[str, str]],
+        columns_dict: Mapping[str, str],
+        bind_params: list[BindParameter[str]],
+) -> str:
+    cursor_values = decode_cursor(cursor, keyset_order)
+
+    equal_conditions: list[str] = []
+    after_conditions: list[str] = []
+    for i, ((column_name, direction), value) in enumerate(zip(keyset_order, cursor_values)):
+        column_sql = quote_identifier(column_name)
+
+        value_sql: str | None = None
+        if value is not None:
+            value_sql = get_column_value_sql_statement_and_add_bind_param(
+                value,
+                columns_dict[column_name],
+                f"cursor_value_{i}",
+                bind_params,
+            )
+
+        # Condition for rows that go after cursor value in current column
+        column_after_condition: str | None
+        if direction.lower() == "desc":
+            column_after_condition = f"{column_sql} IS NOT NULL" if value_sql is None \
+                else f"{column_sql} < {value_sql}"
+        else:
+            column_after_condition = None if value_sql is None \
+                else f"({column_sql} > {value_sql} OR {column_sql} IS NULL)"
+
+        if column_after_condition is not None:
+            after_conditions.append(" AND ".join([*equal_conditions, column_after_condition]))
+
+        equal_conditions.append(f"{column_sql} IS NULL" if value_sql is None else f"{column_sql} = {value_sql}")
+
+    if len(after_conditions) == 0:
+        return "FALSE"
+
+    return "(" + " OR ".join([f"({condition})" for condition in after_conditions]) + ")"
 
 
 # Gets list of columns and returns dict: column_name -> column_data_type
@@ -110,7 +367,7 @@ def validate_cron_value(
     if value is None:
         return "invalid value of type cron: NULL"
 
-    is_valid = croniter.is_valid(value)
+    is_valid = is_valid_cron_expression(value) if isinstance(value, str) else croniter.is_valid(value)
     if is_valid:
         return None
 
@@ -134,16 +391,21 @@ def get_value_validation_info(
     if data_type == ColumnDataType.Cron.value:
         return validate_cron_value(value), True
 
-    return None, False
+    # Validate value without database if it's possible
+    try:
+        formatted_value = format_column_validation_value(value, data_type)
+    except TypeError:
+        return None, False
 
+    return validate_formatted_value_locally(formatted_value, data_type)
 
-# Function that uses possibly overridden type for validation of value from specific table and column
-def get_table_column_value_validation_info(
-        value: Any,
+
+# Returns type which is used for validation of values from specific table and column. It can be overridden
+def get_table_column_validation_type(
         initial_data_type: str,
         table_name: str,
         column_name: str,
-) -> (str | None, bool):
+) -> str:
     data_type = initial_data_type
 
     # Check if column has overridden validation type
@@ -152,28 +414,34 @@ def get_table_column_value_validation_info(
         if column_name in table_column_types:
             data_type = table_column_types[column_name]
 
-    return get_value_validation_info(value, data_type)
+    return data_type
 
 
-# Validates column value and throws error if value is not valid
-def validate_table_column_value(
+# Function that uses possibly overridden type for validation of value from specific table and column
+def get_table_column_value_validation_info(
         value: Any,
         initial_data_type: str,
         table_name: str,
         column_name: str,
-):
-    validation_error, _ = get_table_column_value_validation_info(
-        value=value,
-        initial_data_type=initial_data_type,
-        table_name=table_name,
-        column_name=column_name
-    )
+) -> (str | None, bool):
+    data_type = get_table_column_validation_type(initial_data_type, table_name, column_name)
+    return get_value_validation_info(value, data_type)
 
-    if validation_error is not None:
-        raise HTTPException(
-            status_code=400,
-            detail=validation_error,
+
+# Error of written data validation. Contains errors of all invalid cells, detail is the first of them
+class DataValidationError(HTTPException):
+    def __init__(
+            self,
+            errors: Mapping[str, Mapping[str, Mapping[str, str]]],
+    ):
+        first_error = next(
+            error
+            for rows_errors in errors.values()
+            for row_errors in rows_errors.values()
+            for error in row_errors.values()
         )
+        super().__init__(status_code=400, detail=first_error)
+        self.errors = errors
 
 
 def parse_database_error(
@@ -199,6 +467,8 @@ def check_table_availability(
             detail=f"Table \'{table_name}\' doesn't exist in \'{settings.db.database_schema}\' schema",
         )
 
+    set_request_table_name(table_name)
+
 
 # Gets value and its type, returns sql statement for value and bind param
 def get_column_value_sql_statement_and_bind_param(
@@ -226,3 +496,49 @@ def get_column_value_sql_statement_and_add_bind_param(
     bind_params.append(bind_param)
 
     return sql_value
+
+
+# Splits list into consecutive parts with specified max size
+def get_batches(
+        items: Sequence[T],
+        batch_size: int,
+) -> Iterator[Sequence[T]]:
+    for i in range(0, len(items), batch_size):
+        yield items[i:i + batch_size]
+
+
+# Returns weak ETag of response built from version of table data and parameters of request
+def get_etag(
+        table_version: str,
+        request_shape: Any,
+) -> str:
+    request_json = orjson.dumps(request_shape, default=str, option=orjson.OPT_SORT_KEYS)
+    return f'W/"{hashlib.md5(table_version.encode() + request_json).hexdigest()}"'
+
+
+# Checks if ETag matches one of ETags from If-None-Match header. Weak comparison is used
+def is_etag_matched(
+        if_none_match: str | None,
+        etag: str,
+) -> bool:
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag
+        for tag in if_none_match.split(",")
+    )
+
+
+# Returns headers for caching of response with data of dictionary table
+def get_cache_headers(
+        etag: str,
+) -> dict[str, str]:
+    max_age = settings.datasource.dictionary_cache_max_age
+    return {
+        'ETag': etag,
+        'Cache-Control': f"private, max-age={max_age}" if max_age > 0 else "private, no-cache",
+    }
@@ -0,0 +1,217 @@
+import json
+import re
+from datetime import datetime, time
+from typing import Any, Callable
+
+from enums import ColumnDataType
+
+# Local validators check values already formatted for casting in database (see format_column_validation_value)
+# and return tuple:
+# - error message or None;
+# - bool which indicates if value has been validated.
+# Validators only accept values which database surely accepts (or reject values with the same message as database
+# does). Other values are not validated locally and must be validated by database, because error messages and accepted
+# formats depend on database version.
+
+# Patterns are ASCII-only: database accepts only ASCII digits and whitespace, while in python they match any Unicode
+# digits and whitespace
+INTEGER_PATTERN = re.compile(r"^\s*[+-]?\d+\s*$", re.ASCII)
+TIMESTAMP_PATTERN = re.compile(r"^\s*\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?)?\s*$", re.ASCII)
+TIME_PATTERN = re.compile(r"^\s*\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?\s*$", re.ASCII)
+INTERVAL_UNITS = "microseconds?|milliseconds?|seconds?|minutes?|hours?|days?|weeks?|months?|years?"
+# Minutes and seconds of interval time part are limited to 59, hours aren't
+INTERVAL_TIME = r"\d{1,2}:[0-5]\d(:[0-5]\d)?"
+INTERVAL_PATTERN = re.compile(
+    rf"^\s*(([+-]?\d+\s*({INTERVAL_UNITS})\s*)+(\s+{INTERVAL_TIME})?|{INTERVAL_TIME})\s*$",
+    re.IGNORECASE | re.ASCII,
+)
+INTERVAL_TERM_PATTERN = re.compile(rf"([+-]?\d+)\s*({INTERVAL_UNITS})", re.IGNORECASE | re.ASCII)
+INTERVAL_TIME_PATTERN = re.compile(INTERVAL_TIME, re.ASCII)
+# Unit of interval -> (field of interval, amount of field units in unit). Interval is stored as months, days and
+# microseconds, each of them can overflow
+INTERVAL_UNIT_FIELDS: dict[str, tuple[str, int]] = {
+    "microsecond": ("microseconds", 1),
+    "millisecond": ("microseconds", 1000),
+    "second": ("microseconds", 1000 ** 2),
+    "minute": ("microseconds", 60 * 1000 ** 2),
+    "hour": ("microseconds", 60 * 60 * 1000 ** 2),
+    "day": ("days", 1),
+    "week": ("days", 7),
+    "month": ("months", 1),
+    "year": ("months", 12),
+}
+INTERVAL_FIELD_MAX_VALUES: dict[str, int] = {
+    "months": 2 ** 31 - 1,
+    "days": 2 ** 31 - 1,
+    "microseconds": 2 ** 63 - 1,
+}
+# Units which can't be used together with time part
+INTERVAL_TIME_UNITS = {"hour", "minute", "second", "millisecond", "microsecond"}
+# Numbers of interval are parsed by database as 4-byte integers
+INTERVAL_NUMBER_MAX_VALUE = 2 ** 31 - 1
+# Zero character and surrogates can't be stored in database strings
+UNSUPPORTED_CHARACTERS_PATTERN = re.compile("[\x00\ud800-\udfff]")
+# Escaped zero character and surrogates in JSON strings. Database rejects zero character and lone surrogates
+JSON_UNSUPPORTED_ESCAPE_PATTERN = re.compile(r"\\u(0000|[dD][89abAB][0-9a-fA-F]{2})")
+# Array elements which are parsed by database as is (without quotes and escaping)
+ARRAY_ELEMENT_PATTERN = re.compile(r'^[^{}",\\\s]+$')
+
+INTEGER_RANGES: dict[str, tuple[int, int]] = {
+    ColumnDataType.Integer.value: (-2 ** 31, 2 ** 31 - 1),
+    ColumnDataType.Bigint.value: (-2 ** 63, 2 ** 63 - 1),
+}
+
+
+def validate_integer_value(
+        value: str,
+        data_type: str,
+) -> (str | None, bool):
+    if not INTEGER_PATTERN.match(value):
+        return None, False
+
+    min_value, max_value = INTEGER_RANGES[data_type]
+    if min_value <= int(value) <= max_value:
+        return None, True
+
+    return f"value \"{value}\" is out of range for type {data_type}", True
+
+
+def validate_timestamp_value(
+        value: str,
+        data_type: str,
+) -> (str | None, bool):
+    if not TIMESTAMP_PATTERN.match(value):
+        return None, False
+
+    try:
+        datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None, False
+
+    return None, True
+
+
+def validate_time_value(
+        value: str,
+        data_type: str,
+) -> (str | None, bool):
+    if not TIME_PATTERN.match(value):
+        return None, False
+
+    try:
+        time.fromisoformat(value.strip())
+    except ValueError:
+        return None, False
+
+    return None, True
+
+
+# Database rejects repeated units, units of time together with time part and values out of range of interval fields.
+# Absolute values of terms are summed, so sum of terms with different signs can't overflow too
+def validate_interval_value(
+        value: str,
+        data_type: str,
+) -> (str | None, bool):
+    if not INTERVAL_PATTERN.match(value):
+        return None, False
+
+    units: set[str] = set()
+    field_values = dict.fromkeys(INTERVAL_FIELD_MAX_VALUES, 0)
+    for number, unit in INTERVAL_TERM_PATTERN.findall(value):
+        unit = unit.lower().removesuffix("s")
+        if unit in units or abs(int(number)) > INTERVAL_NUMBER_MAX_VALUE:
+            return None, False
+        units.add(unit)
+
+        field, multiplier = INTERVAL_UNIT_FIELDS[unit]
+        field_values[field] += abs(int(number)) * multiplier
+
+    time_match = INTERVAL_TIME_PATTERN.search(value)
+    if time_match is not None:
+        if units & INTERVAL_TIME_UNITS:
+            return None, False
+
+        for part, multiplier in zip(time_match.group().split(":"), (60 * 60, 60, 1)):
+            field_values["microseconds"] += int(part) * multiplier * 1000 ** 2
+
+    return None, all(
+        field_value <= INTERVAL_FIELD_MAX_VALUES[field]
+        for field, field_value in field_values.items()
+    )
+
+
+def raise_on_json_constant(
+        value: str,
+):
+    raise ValueError(f"Unsupported JSON constant {value}")
+
+
+def validate_jsonb_value(
+        value: str,
+        data_type: str,
+) -> (str | None, bool):
+    if JSON_UNSUPPORTED_ESCAPE_PATTERN.search(value):
+        return None, False
+
+    try:
+        # NaN and Infinity are accepted by python, but not by database
+        json.loads(value, parse_constant=raise_on_json_constant)
+    except (ValueError, RecursionError):
+        # Too deeply nested values are left for database too
+        return None, False
+
+    return None, True
+
+
+def validate_array_value(
+        value: str,
+        data_type: str,
+) -> (str | None, bool):
+    if not value.startswith("{") or not value.endswith("}"):
+        return None, False
+
+    elements = value[1:-1]
+    if elements == "":
+        return None, True
+
+    return None, all(ARRAY_ELEMENT_PATTERN.match(element) for element in elements.split(","))
+
+
+def validate_text_value(
+        value: str,
+        data_type: str,
+) -> (str | None, bool):
+    return None, True
+
+
+LOCAL_VALIDATORS: dict[str, Callable[[str, str], tuple[str | None, bool]]] = {
+    ColumnDataType.Integer.value: validate_integer_value,
+    ColumnDataType.Bigint.value: validate_integer_value,
+    ColumnDataType.Text.value: validate_text_value,
+    ColumnDataType.TimestampWithoutTimeZone.value: validate_timestamp_value,
+    ColumnDataType.TimeWithoutTimeZone.value: validate_time_value,
+    ColumnDataType.Interval.value: validate_interval_value,
+    ColumnDataType.Jsonb.value: validate_jsonb_value,
+    ColumnDataType.Array.value: validate_array_value,
+}
+
+
+# Validates value formatted for database without database. Returns tuple:
+# - error message or None;
+# - bool which indicates if value has been validated.
+def validate_formatted_value_locally(
+        formatted_value: Any,
+        data_type: str,
+) -> (str | None, bool):
+    validator = LOCAL_VALIDATORS.get(data_type)
+    if validator is None:
+        return None, False
+
+    # NULL can be casted to any type
+    if formatted_value is None:
+        return None, True
+
+    if UNSUPPORTED_CHARACTERS_PATTERN.search(formatted_value):
+        return None, False
+
+    return validator(formatted_value, data_type)
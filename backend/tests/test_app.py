@@ -0,0 +1,7 @@
+# Importing app checks that all modules of backend can be imported with installed dependencies
+def test_app_is_importable():
+    from main import main_app
+
+    route_paths = {route.path for route in main_app.routes}
+    assert "/api/datasource/data" in route_paths
+    assert "/health" in route_paths
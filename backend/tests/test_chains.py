@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from crud.chains import get_schedule_next_runs
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_schedule_next_runs():
+    next_runs, error = get_schedule_next_runs("0 10 * * *", BASE_TIME, 2)
+
+    assert error is None
+    assert next_runs == [datetime(2024, 1, 1, 10, tzinfo=timezone.utc), datetime(2024, 1, 2, 10, tzinfo=timezone.utc)]
+
+
+@pytest.mark.parametrize("schedule", [None, "None"])
+def test_not_scheduled_chain_has_no_next_runs(schedule):
+    assert get_schedule_next_runs(schedule, BASE_TIME, 2) == ([], None)
+
+
+@pytest.mark.parametrize("schedule", ["0 10 * *", "every day", "0 0 31 2 *"])
+def test_invalid_schedule_returns_error(schedule):
+    next_runs, error = get_schedule_next_runs(schedule, BASE_TIME, 2)
+
+    assert next_runs == []
+    assert error is not None
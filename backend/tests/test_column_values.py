@@ -0,0 +1,90 @@
+from sqlalchemy import text
+
+from config import settings
+from crud import datasource_column as datasource_column_crud
+from db_helper import db_helper
+from schemas.datasource_column import ValuesSearchMode
+
+TABLE_NAME = "test_column_values"
+ROWS_SQL = """('apple', 'Fruit'), ('apple', 'Fruit'), ('Apple', NULL), ('apricot', NULL), ('banana', 'Yellow'),
+    ('pineapple', NULL), ('pineapple', 'Tree'), (NULL, 'Unknown')"""
+
+
+# Creates table with values and descriptions, runs function with session and drops table
+async def run_with_values_table(function):
+    table_sql = f"{settings.db.database_schema}.{TABLE_NAME}"
+    async with db_helper.session_factory() as session:
+        await session.execute(text(f"CREATE TABLE {table_sql} (value text, description text)"))
+        await session.execute(text(f"INSERT INTO {table_sql} VALUES {ROWS_SQL}"))
+        await session.commit()
+
+        try:
+            return await function(session)
+        finally:
+            await session.rollback()
+            await session.execute(text(f"DROP TABLE {table_sql}"))
+            await session.commit()
+
+
+async def read_values(session, **kwargs):
+    values = await datasource_column_crud.get_datasource_column_values(
+        session=session,
+        table_name=TABLE_NAME,
+        value_column_name="value",
+        description_column_name="description",
+        **kwargs,
+    )
+    return [(row["value"], row["description"]) for row in values]
+
+
+def test_values_are_searched_by_prefix_and_contained_text(run):
+    async def search_values(session):
+        return (
+            await read_values(session, search="ap", search_mode=ValuesSearchMode.PREFIX),
+            await read_values(session, search="APP", search_mode=ValuesSearchMode.CONTAINS),
+        )
+
+    prefix_values, contained_values = run(run_with_values_table(search_values))
+
+    # Prefix search is case-sensitive, search of contained text isn't
+    assert prefix_values == [("apple", "Fruit"), ("apple", "Fruit"), ("apricot", None)]
+    # Order of values differing only in case depends on collation of database
+    assert sorted(contained_values, key=repr) == [
+        ("Apple", None), ("apple", "Fruit"), ("apple", "Fruit"), ("pineapple", "Tree"), ("pineapple", None),
+    ]
+
+
+def test_distinct_values_collapse_duplicates(run):
+    async def read_distinct_values(session):
+        return await read_values(session, search="apple", search_mode=ValuesSearchMode.PREFIX, distinct=True)
+
+    assert run(run_with_values_table(read_distinct_values)) == [("apple", "Fruit")]
+
+
+def test_values_pages_equal_unpaged_read(run):
+    async def read_pages_and_all_values(session):
+        pages = []
+        cursor = None
+        while True:
+            values = await datasource_column_crud.get_datasource_column_values(
+                session=session,
+                table_name=TABLE_NAME,
+                value_column_name="value",
+                description_column_name="description",
+                limit=2,
+                cursor=cursor,
+            )
+            pages.extend((row["value"], row["description"]) for row in values)
+            cursor = datasource_column_crud.get_column_values_next_cursor(
+                values=values,
+                limit=2,
+                need_description_column=True,
+            )
+            if cursor is None:
+                return pages, await read_values(session, distinct=True)
+
+    pages, all_values = run(run_with_values_table(read_pages_and_all_values))
+
+    assert pages == all_values
+    assert ("pineapple", None) in pages
+    assert (None, "Unknown") in pages
@@ -0,0 +1,11 @@
+import pytest
+from pydantic import ValidationError
+
+from schemas.datasource import DatasourceDataReadInput
+
+
+def test_columns_to_read_can_not_be_empty():
+    with pytest.raises(ValidationError):
+        DatasourceDataReadInput(columns=[])
+
+    assert DatasourceDataReadInput(columns=["load_type"]).columns == ["load_type"]
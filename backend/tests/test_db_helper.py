@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+from config import settings
+from db_helper import DatabaseHelper
+
+
+# Replica accepts connections, but never responds
+async def start_unresponsive_server() -> asyncio.Server:
+    async def handle_connection(reader, writer):
+        await asyncio.sleep(60)
+
+    return await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+
+
+async def get_read_session_factories(replica_url: str, checks_amount: int):
+    helper = DatabaseHelper(
+        url=str(settings.db.url),
+        replica_url=replica_url,
+        replica_check_interval=0.1,
+        replica_check_timeout=0.2,
+    )
+    try:
+        session_factories = []
+        durations = []
+        for _ in range(checks_amount):
+            started_at = time.monotonic()
+            session_factories.append(await helper.get_read_session_factory())
+            durations.append(time.monotonic() - started_at)
+            await asyncio.sleep(0.1)
+        return helper, session_factories, durations
+    finally:
+        await helper.dispose()
+
+
+def test_reads_dont_wait_for_unresponsive_replica():
+    async def read_with_unresponsive_replica():
+        server = await start_unresponsive_server()
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await get_read_session_factories(f"postgresql+asyncpg://user@127.0.0.1:{port}/db", 5)
+        finally:
+            server.close()
+
+    helper, session_factories, durations = asyncio.run(read_with_unresponsive_replica())
+
+    assert all(session_factory is helper.session_factory for session_factory in session_factories)
+    assert max(durations) < 0.05
+    assert helper.replica_lag is None
+    assert helper.replica_checked_at is not None
+
+
+def test_available_replica_is_used_after_check(database):
+    helper, session_factories, _ = asyncio.run(get_read_session_factories(str(settings.db.url), 3))
+
+    # Replica isn't used until it's checked
+    assert session_factories[0] is helper.session_factory
+    assert session_factories[-1] is helper.replica_session_factory
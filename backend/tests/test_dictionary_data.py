@@ -0,0 +1,58 @@
+from sqlalchemy import text
+
+from config import settings
+from db_helper import db_helper
+
+DICTIONARY_DATA_URL = "/api/datasource/dictionary_data?table_name=d_load_type"
+
+
+async def execute_statement(statement: str):
+    async with db_helper.session_factory() as session:
+        await session.execute(text(statement))
+        await session.commit()
+
+
+async def request_dictionary_data(client):
+    response = await client.get(DICTIONARY_DATA_URL)
+    etag = response.headers["ETag"]
+    not_modified_response = await client.get(DICTIONARY_DATA_URL, headers={"If-None-Match": etag})
+
+    # Change of table data made outside of app changes its version
+    table_name = f"{settings.db.database_schema}.d_load_type"
+    await execute_statement(f"INSERT INTO {table_name} (load_type) VALUES ('TEST_VERSION')")
+    try:
+        changed_response = await client.get(DICTIONARY_DATA_URL, headers={"If-None-Match": etag})
+    finally:
+        await execute_statement(f"DELETE FROM {table_name} WHERE load_type = 'TEST_VERSION'")
+    restored_response = await client.get(DICTIONARY_DATA_URL, headers={"If-None-Match": etag})
+
+    post_response = await client.post(
+        "/api/datasource/data?table_name=d_load_type",
+        json={},
+        headers={"If-None-Match": etag},
+    )
+    return response, not_modified_response, changed_response, restored_response, post_response
+
+
+def test_dictionary_data_is_read_conditionally(run_with_client):
+    response, not_modified_response, changed_response, restored_response, post_response = run_with_client(
+        request_dictionary_data,
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]) > 0
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.headers["ETag"] == response.headers["ETag"]
+    assert changed_response.status_code == 200
+    assert changed_response.headers["ETag"] != response.headers["ETag"]
+    # Version depends only on data of table
+    assert restored_response.status_code == 304
+    # Conditional requests are supported only by GET
+    assert post_response.status_code == 200
+    assert "ETag" not in post_response.headers
+
+
+def test_dictionary_data_isnt_read_for_other_tables(run_with_client):
+    response = run_with_client(lambda client: client.get("/api/datasource/dictionary_data?table_name=logs"))
+
+    assert response.status_code == 400
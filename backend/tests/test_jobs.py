@@ -0,0 +1,135 @@
+import asyncio
+
+import orjson
+
+from jobs import STOPPED_JOB_ERROR, JobRunner
+
+
+def write_journal_lines(journal_path, states):
+    with open(journal_path, "ab") as journal:
+        for state in states:
+            journal.write(orjson.dumps(state, option=orjson.OPT_APPEND_NEWLINE))
+
+
+def read_journal_lines(journal_path):
+    with open(journal_path, "rb") as journal:
+        return [orjson.loads(line) for line in journal]
+
+
+def test_journal_is_compacted_on_start(tmp_path):
+    journal_path = str(tmp_path / "jobs.jsonl")
+    states = []
+    for i in range(5):
+        states.append({'id': f"job{i}", 'status': "queued"})
+        states.append({'id': f"job{i}", 'status': "running"})
+        states.append({'id': f"job{i}", 'status': "succeeded", 'result': i})
+    states.append({'id': "job5", 'status': "running", 'owner': "killed"})
+    write_journal_lines(journal_path, states)
+    # Owner file of killed process remains, but isn't locked anymore
+    (tmp_path / "jobs.jsonl.killed.owner").touch()
+
+    async def start_and_stop_runner():
+        runner = JobRunner(workers=1, queue_size=10, max_finished_jobs=2, journal_path=journal_path)
+        await runner.start()
+        await runner.stop(timeout=0)
+
+    asyncio.run(start_and_stop_runner())
+
+    # The last states of two recent finished jobs are kept. Job of stopped process is marked as failed
+    lines = read_journal_lines(journal_path)
+    assert lines[:2] == [
+        {'id': "job3", 'status': "succeeded", 'result': 3},
+        {'id': "job4", 'status': "succeeded", 'result': 4},
+    ]
+    assert lines[2]['id'] == "job5"
+    assert lines[2]['status'] == "failed"
+    assert lines[2]['error'] == STOPPED_JOB_ERROR
+    assert not (tmp_path / "jobs.jsonl.killed.owner").exists()
+
+
+def test_job_of_started_runner_isnt_failed_by_other_runner(tmp_path):
+    journal_path = str(tmp_path / "jobs.jsonl")
+
+    async def run_jobs():
+        owner = JobRunner(workers=1, queue_size=10, max_finished_jobs=10, journal_path=journal_path)
+        other = JobRunner(workers=1, queue_size=10, max_finished_jobs=10, journal_path=journal_path)
+        job_started = asyncio.Event()
+        job_released = asyncio.Event()
+
+        async def handler(params):
+            job_started.set()
+            await job_released.wait()
+            return 1
+
+        owner.register_handler("test", handler)
+        await owner.start()
+        job = owner.submit("test", {})
+        await job_started.wait()
+
+        # Other process is started while job is running
+        await other.start()
+        running_state = await other.get_job_state(job.id)
+
+        job_released.set()
+        finished_state = await other.wait_job_state(job.id, timeout=5)
+        await other.stop(timeout=0)
+        await owner.stop(timeout=0)
+        return running_state, finished_state
+
+    running_state, finished_state = asyncio.run(run_jobs())
+
+    assert running_state['status'] == "running"
+    assert finished_state['status'] == "succeeded"
+    assert finished_state['result'] == 1
+    # Owner files are removed on stop
+    assert [path.name for path in tmp_path.iterdir() if path.name.endswith(".owner")] == []
+
+
+def test_job_of_other_process_is_read_from_journal_once_finished(tmp_path):
+    journal_path = str(tmp_path / "jobs.jsonl")
+    runner = JobRunner(workers=1, queue_size=10, max_finished_jobs=10, journal_path=journal_path)
+
+    async def get_job_state():
+        return await runner.get_job_state("job1")
+
+    assert asyncio.run(get_job_state()) is None
+
+    write_journal_lines(journal_path, [{'id': "job1", 'status': "running"}])
+    assert asyncio.run(get_job_state())['status'] == "running"
+
+    write_journal_lines(journal_path, [{'id': "job1", 'status': "succeeded", 'result': 1}])
+    assert asyncio.run(get_job_state())['result'] == 1
+
+    # State of finished job is kept in memory, so journal isn't read anymore
+    (tmp_path / "jobs.jsonl").unlink()
+    assert asyncio.run(get_job_state())['result'] == 1
+
+
+def test_journal_is_compacted_when_it_grows(tmp_path):
+    journal_path = str(tmp_path / "jobs.jsonl")
+
+    async def run_jobs():
+        runner = JobRunner(
+            workers=2,
+            queue_size=100,
+            max_finished_jobs=5,
+            journal_path=journal_path,
+            journal_max_size=2000,
+        )
+
+        async def handler(params):
+            return params['value']
+
+        runner.register_handler("test", handler)
+        await runner.start()
+        jobs = [runner.submit("test", {'value': i}) for i in range(100)]
+        await asyncio.gather(*[job.finished.wait() for job in jobs])
+        await runner.stop(timeout=0)
+        return jobs
+
+    jobs = asyncio.run(run_jobs())
+
+    lines = read_journal_lines(journal_path)
+    assert len(lines) < 100
+    job_states = {line['id']: line for line in lines}
+    assert job_states[jobs[-1].id]['result'] == 99
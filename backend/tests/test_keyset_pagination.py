@@ -0,0 +1,48 @@
+DATA_URL = "/api/datasource/data"
+
+
+# Reads all rows of table by keyset pages of one row
+async def read_by_keyset_pages(client, table_name, order_by):
+    rows = []
+    cursor = None
+    while True:
+        response = await client.post(
+            f"{DATA_URL}?table_name={table_name}&limit=1",
+            json={"pagination": "keyset", "order_by": order_by, "cursor": cursor},
+        )
+        if response.status_code != 200:
+            return response.status_code, rows
+
+        content = response.json()
+        rows.extend(content["data"])
+        cursor = content["next_cursor"]
+        if cursor is None:
+            return response.status_code, rows
+
+
+def test_keyset_pages_contain_all_rows(run_with_client):
+    async def read_pages_and_whole_table(client):
+        pages_result = await read_by_keyset_pages(client, "d_load_type", {"desc_short": "DESC"})
+        # Keyset order is completed by primary key, so unpaged read uses the same order
+        response = await client.post(
+            f"{DATA_URL}?table_name=d_load_type&limit=0",
+            json={"order_by": {"desc_short": "DESC", "load_type": "ASC"}},
+        )
+        return pages_result, response
+
+    (status_code, rows), response = run_with_client(read_pages_and_whole_table)
+
+    assert status_code == 200
+    assert response.status_code == 200
+    assert len(rows) > 0
+    assert rows == response.json()["data"]
+
+
+# Order of rows of view can be non-unique, so rows with equal values would be skipped between pages
+def test_keyset_pagination_requires_primary_key(run_with_client):
+    status_code, rows = run_with_client(
+        lambda client: read_by_keyset_pages(client, "load_status_today", {"Последнее обновление": "ASC"}),
+    )
+
+    assert status_code == 400
+    assert rows == []
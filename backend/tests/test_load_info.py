@@ -0,0 +1,9 @@
+# Database rejects load group with zero byte, error is returned to client instead of internal server error
+def test_bulk_generation_returns_database_error(run_with_client):
+    response = run_with_client(lambda client: client.post(
+        "/api/load_info/generate_bulk",
+        json={"load_group": "group\u0000"},
+    ))
+
+    assert response.status_code == 400
+    assert response.json()["detail"]
@@ -0,0 +1,35 @@
+import os
+
+from config import settings
+from consts import PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE
+from server import get_worker_pool_sizes, prepare_workers_environment
+
+
+def test_worker_pool_sizes_fit_budget():
+    assert get_worker_pool_sizes(connections_budget=60, workers=4, pool_size=50, max_overflow=10) == (12, 3)
+    assert get_worker_pool_sizes(connections_budget=240, workers=4, pool_size=50, max_overflow=10) == (50, 10)
+
+
+# Without budget several workers together don't open more connections than one process
+def test_workers_share_pool_of_one_process_by_default(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings.run, "db_connections_budget", None)
+    monkeypatch.setenv(PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE, str(tmp_path))
+    monkeypatch.setenv("APP_CONFIG__DB__POOL_SIZE", "")
+    monkeypatch.setenv("APP_CONFIG__DB__MAX_OVERFLOW", "")
+
+    prepare_workers_environment(workers=4)
+
+    pool_size = int(os.environ["APP_CONFIG__DB__POOL_SIZE"])
+    max_overflow = int(os.environ["APP_CONFIG__DB__MAX_OVERFLOW"])
+    assert 4 * (pool_size + max_overflow) <= settings.db.pool_size + settings.db.max_overflow
+
+
+# Several workers share states of jobs through journal even if its path isn't configured
+def test_workers_share_jobs_journal_by_default(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings.jobs, "journal_path", None)
+    monkeypatch.setenv(PROMETHEUS_MULTIPROCESS_DIRECTORY_VARIABLE, str(tmp_path))
+    monkeypatch.setenv("APP_CONFIG__JOBS__JOURNAL_PATH", "")
+
+    prepare_workers_environment(workers=4)
+
+    assert os.environ["APP_CONFIG__JOBS__JOURNAL_PATH"] != ""
@@ -0,0 +1,46 @@
+import asyncio
+
+from sqlalchemy import text
+
+from config import settings
+from crud import datasource as datasource_crud
+from db_helper import DatabaseHelper
+from single_flight import datasource_single_flight
+
+CONCURRENT_READS = 6
+
+
+async def read_data_by_requests_with_small_pool():
+    small_pool_db_helper = DatabaseHelper(
+        url=str(settings.db.url),
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=2,
+    )
+
+    async def read_data():
+        async with small_pool_db_helper.session_factory() as session:
+            # Request already holds connection when data is read (e.g. after reading table version)
+            await session.execute(text("SELECT 1"))
+            return await datasource_crud.get_datasource_data(
+                session=session,
+                table_name="d_load_type",
+                skip=0,
+                limit=100,
+            )
+
+    try:
+        return await asyncio.gather(*[read_data() for _ in range(CONCURRENT_READS)])
+    finally:
+        await small_pool_db_helper.dispose()
+
+
+def test_coalesced_reads_dont_exhaust_pool(run):
+    stats_before = datasource_single_flight.get_stats()
+
+    results = run(read_data_by_requests_with_small_pool())
+
+    assert len(results) == CONCURRENT_READS
+    assert all(len(result) == len(results[0]) > 0 for result in results)
+    stats = datasource_single_flight.get_stats()
+    assert stats["coalesced"] > stats_before["coalesced"]
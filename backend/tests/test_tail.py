@@ -0,0 +1,92 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from config import settings
+from crud import datasource as datasource_crud
+from db_helper import db_helper
+from tail import TailReader
+from utils import encode_cursor
+
+TABLE_NAME = "test_tail_rows"
+COLUMN_NAME = "updated_dttm"
+
+
+# Reads all rows of table by tail pages of 2 rows. Most rows have the same value of tail column
+async def read_tail_by_pages():
+    table_sql = f"{settings.db.database_schema}.{TABLE_NAME}"
+    async with db_helper.session_factory() as session:
+        await session.execute(text(f"CREATE TABLE {table_sql} (id int, {COLUMN_NAME} timestamp)"))
+        await session.execute(text(
+            f"""INSERT INTO {table_sql}
+            VALUES (1, '2024-01-01 10:00'), (2, '2024-01-01 11:00'), (3, '2024-01-01 11:00'),
+                (4, '2024-01-01 11:00'), (5, '2024-01-01 11:00'), (6, '2024-01-01 12:00')"""
+        ))
+        await session.commit()
+
+        try:
+            pages = []
+            cursor = encode_cursor([(COLUMN_NAME, "asc")], {COLUMN_NAME: datetime(2024, 1, 1)})
+            while True:
+                rows = await datasource_crud.get_datasource_tail_data(
+                    session=session,
+                    table_name=TABLE_NAME,
+                    column_name=COLUMN_NAME,
+                    cursor=cursor,
+                    limit=2,
+                )
+                if len(rows) == 0:
+                    return pages
+                pages.append([row["id"] for row in rows])
+                cursor = encode_cursor([(COLUMN_NAME, "asc")], rows[-1])
+        finally:
+            await session.rollback()
+            await session.execute(text(f"DROP TABLE {table_sql}"))
+            await session.commit()
+
+
+def test_tail_page_isnt_cut_inside_equal_values(run):
+    pages = run(read_tail_by_pages())
+
+    assert [sorted(page) for page in pages] == [[1, 2, 3, 4, 5], [6]]
+
+
+# Reads new rows of table, while row with smaller value of tail column is committed after rows with greater ones
+async def read_tail_with_late_row():
+    table_sql = f"{settings.db.database_schema}.{TABLE_NAME}"
+    async with db_helper.session_factory() as session:
+        await session.execute(text(f"CREATE TABLE {table_sql} (id int, {COLUMN_NAME} timestamp)"))
+        await session.execute(text(
+            f"""INSERT INTO {table_sql}
+            VALUES (1, '2024-01-01 10:00'), (2, '2024-01-01 11:00'), (4, '2024-01-01 13:00')"""
+        ))
+        await session.commit()
+
+        try:
+            reader = TailReader(
+                table_name=TABLE_NAME,
+                column_name=COLUMN_NAME,
+                cursor=encode_cursor([(COLUMN_NAME, "asc")], {COLUMN_NAME: datetime(2024, 1, 1, 10)}),
+            )
+            reads = []
+            rows, _ = await reader.read()
+            reads.append([row["id"] for row in rows])
+
+            await session.execute(text(
+                f"INSERT INTO {table_sql} VALUES (3, '2024-01-01 12:00'), (5, '2024-01-01 14:00')"
+            ))
+            await session.commit()
+            for _ in range(2):
+                rows, _ = await reader.read()
+                reads.append([row["id"] for row in rows])
+            return reads
+        finally:
+            await session.rollback()
+            await session.execute(text(f"DROP TABLE {table_sql}"))
+            await session.commit()
+
+
+def test_late_committed_row_is_read_once(run, monkeypatch):
+    monkeypatch.setattr(settings.tail, "lookback_rows", 2)
+
+    assert run(read_tail_with_late_row()) == [[2, 4], [3, 5], []]
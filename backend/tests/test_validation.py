@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import text
+
+from crud import datasource as datasource_crud
+from crud import validation as validation_crud
+from db_helper import db_helper
+from utils import DataValidationError
+
+# More values than columns allowed in one select list (1664)
+VALUES_AMOUNT = 2000
+# Objects are inserted with ids which aren't used by other data
+FIRST_OBJECT_ID = 1_000_000
+
+
+def get_validation_statements(statements: list[str]) -> list[str]:
+    return [statement for statement in statements if "validated_value" in statement]
+
+
+async def validate_values(values):
+    async with db_helper.session_factory() as session:
+        return await validation_crud.validate_values_of_data_types(session=session, values=values)
+
+
+def test_many_valid_values_are_validated_by_one_statement(run, executed_statements):
+    # Dates are not validated locally
+    values = [(f"2024-01-{i % 28 + 1:02d}", "date") for i in range(VALUES_AMOUNT)]
+
+    errors = run(validate_values(values))
+
+    assert errors == [None] * VALUES_AMOUNT
+    assert len(get_validation_statements(executed_statements)) == 1
+
+
+def test_invalid_values_are_found_by_few_statements(run, executed_statements):
+    values = [(f"2024-01-{i % 28 + 1:02d}", "date") for i in range(VALUES_AMOUNT)]
+    invalid_indexes = [3, 1700, 1999]
+    for i in invalid_indexes:
+        values[i] = (f"2024-02-3{i % 2}", "date")
+
+    errors = run(validate_values(values))
+
+    assert [i for i, error in enumerate(errors) if error is not None] == invalid_indexes
+    assert "2024-02-31" in errors[1999]
+    assert len(get_validation_statements(executed_statements)) < 100
+
+
+async def insert_objects(rows):
+    try:
+        async with db_helper.session_factory() as session:
+            await datasource_crud.write_data(
+                session=session,
+                table_name="objects",
+                primary_key_column="object_id",
+                edited_rows=None,
+                new_rows=rows,
+            )
+    finally:
+        async with db_helper.session_factory() as session:
+            await session.execute(
+                text("DELETE FROM fw.objects WHERE object_id >= :first_object_id"),
+                {"first_object_id": FIRST_OBJECT_ID},
+            )
+            await session.commit()
+
+
+def get_new_objects(amount: int):
+    return [
+        {"object_id": FIRST_OBJECT_ID + i, "object_name": f"test_{i}", "active": "true"}
+        for i in range(amount)
+    ]
+
+
+def test_many_rows_are_written_by_few_statements(run, executed_statements):
+    run(insert_objects(get_new_objects(VALUES_AMOUNT)))
+
+    assert len(executed_statements) < 20
+
+
+def test_invalid_cells_of_many_rows_are_returned(run, executed_statements):
+    rows = get_new_objects(VALUES_AMOUNT)
+    rows[10]["active"] = "maybe"
+    rows[1800]["active"] = "perhaps"
+
+    with pytest.raises(DataValidationError) as error_info:
+        run(insert_objects(rows))
+
+    assert set(error_info.value.errors["new_rows"]) == {"10", "1800"}
+    assert len(executed_statements) < 100
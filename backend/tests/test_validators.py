@@ -0,0 +1,55 @@
+import pytest
+
+from validators import validate_formatted_value_locally
+
+
+@pytest.mark.parametrize("value, data_type", [
+    ("123", "integer"),
+    (" -12 ", "bigint"),
+    ("2024-01-31 10:00:00", "timestamp without time zone"),
+    ("10:30", "time without time zone"),
+    ("1:59", "interval"),
+    ("2 days 10:30:59", "interval"),
+    ("99:59", "interval"),
+    ("1 week 1 day 10:00", "interval"),
+    ("178956970 years", "interval"),
+    ('{"a": ["b", 1]}', "jsonb"),
+])
+def test_valid_values_are_validated_locally(value, data_type):
+    assert validate_formatted_value_locally(value, data_type) == (None, True)
+
+
+def test_out_of_range_integer_is_rejected_locally():
+    error_message, was_validated = validate_formatted_value_locally("2147483648", "integer")
+    assert was_validated
+    assert error_message == "value \"2147483648\" is out of range for type integer"
+
+
+# Values which database can reject (non-ASCII digits and whitespace, out of range intervals, zero characters and
+# surrogates) are left for database validation
+@pytest.mark.parametrize("value, data_type", [
+    ("١٢٣", "integer"),
+    ("12 ", "bigint"),
+    (" 12", "integer"),
+    ("٢٠٢٤-01-31", "timestamp without time zone"),
+    ("2024-01-31 10:00", "timestamp without time zone"),
+    ("١٠:30", "time without time zone"),
+    ("1:99", "interval"),
+    ("1:30:60", "interval"),
+    ("2 days 10:60", "interval"),
+    ("١ day", "interval"),
+    ("99999999999 hours", "interval"),
+    ("1000000000 years", "interval"),
+    ("178956971 years", "interval"),
+    ("1 week 2147483647 days", "interval"),
+    ("1 day 2 days", "interval"),
+    ("1 hour 10:30", "interval"),
+    ('{"a": "\\u0000"}', "jsonb"),
+    ('"\\ud800"', "jsonb"),
+    ("[" * 100000, "jsonb"),
+    ("a\u0000b", "text"),
+    ("a\ud800", "text"),
+    ("{a\u0000}", "ARRAY"),
+])
+def test_values_rejected_by_database_are_not_validated_locally(value, data_type):
+    assert validate_formatted_value_locally(value, data_type) == (None, False)